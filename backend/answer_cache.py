@@ -0,0 +1,95 @@
+"""
+Answer Cache
+Remembers LLM answers to transcript questions until their inputs change
+"""
+
+import os
+import re
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+def normalize_question(question: str) -> str:
+    """Lower-case, drop punctuation and collapse whitespace so rephrasings of spacing/case share a key"""
+    question = re.sub(r"[^\w\s]", " ", question.lower())
+    return " ".join(question.split())
+
+
+def transcript_version(transcript: List[Dict]) -> str:
+    """
+    Cheap version stamp for an append-only transcript: its length plus a hash
+    of the newest entry. Any new final speech changes it.
+    """
+    if not transcript:
+        return "0"
+    last = transcript[-1]
+    digest = hashlib.sha1(
+        f"{last.get('timestamp', '')}|{last.get('speaker', '')}|{last.get('text', '')}".encode("utf-8")
+    ).hexdigest()[:12]
+    return f"{len(transcript)}:{digest}"
+
+
+class AnswerCache:
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, scope: str, question: str, transcript: str, evidence_generation: int, records_revision: int) -> Tuple:
+        """Key an answer on the normalized question plus the version of every input it was built from"""
+        return (scope, normalize_question(question), transcript, evidence_generation, records_revision)
+
+    def get(self, key: Tuple) -> Optional[str]:
+        """Return a cached answer, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, answer = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return answer
+
+    def put(self, key: Tuple, answer: str):
+        """Store an answer, evicting the least recently used entries when full"""
+        self._entries[key] = (time.monotonic(), answer)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every cached answer"""
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Global instance
+answer_cache = AnswerCache(
+    max_entries=int(os.getenv("ANSWER_CACHE_SIZE", "256")),
+    ttl_seconds=float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "600"))
+)
@@ -0,0 +1,126 @@
+"""
+Event-loop latency benchmark for chat questions
+
+Fires N concurrent questions at GroqLLMService while a probe task ticks every
+few milliseconds and records how late each tick fires. Compares the old
+blocking path (sync Groq client inside an async handler) with the async
+client behind the bounded pool.
+
+Usage (from backend/):
+    python benchmarks/chat_event_loop_latency.py                 # simulated LLM
+    python benchmarks/chat_event_loop_latency.py --live          # real Groq API
+    python benchmarks/chat_event_loop_latency.py --questions 50 --latency 1.5
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _fake_response(text):
+    message = SimpleNamespace(content=text)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class SimulatedCompletions:
+    """Stands in for client.chat.completions with a fixed round-trip time"""
+    def __init__(self, latency, is_async):
+        self.latency = latency
+        self.is_async = is_async
+    
+    def create(self, **kwargs):
+        if self.is_async:
+            async def _create():
+                await asyncio.sleep(self.latency)
+                return _fake_response("Simulated answer.")
+            return _create()
+        time.sleep(self.latency)
+        return _fake_response("Simulated answer.")
+
+
+def _simulated_client(latency, is_async):
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimulatedCompletions(latency, is_async)))
+
+
+async def _blocking_ask(service, question, context):
+    """The pre-async code path: sync client called from a coroutine"""
+    response = service.client.chat.completions.create(
+        model=service.model,
+        messages=[{"role": "user", "content": f"{context}\n\nQUESTION: {question}"}],
+        temperature=0.3,
+        max_tokens=500,
+    )
+    return response.choices[0].message.content
+
+
+async def _probe(interval, lags, stop):
+    """Record how late the loop wakes us up compared to the requested interval"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - start - interval)
+
+
+async def run_mode(service, mode, questions, interval):
+    lags = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(interval, lags, stop))
+    await asyncio.sleep(interval * 2)  # Let the probe settle
+    
+    ask = service.ask_question if mode == "async" else (lambda q, c: _blocking_ask(service, q, c))
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        ask(f"What did witness {i} say about the alibi?", "Judge: Court is in session.")
+        for i in range(questions)
+    ])
+    wall = time.perf_counter() - started
+    
+    stop.set()
+    await probe
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "mode": mode,
+        "wall_s": wall,
+        "ticks": len(lags_ms),
+        "lag_p50_ms": statistics.median(lags_ms),
+        "lag_p99_ms": lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))],
+        "lag_max_ms": lags_ms[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=1.0, help="Simulated LLM round trip in seconds")
+    parser.add_argument("--interval", type=float, default=0.01, help="Probe tick interval in seconds")
+    parser.add_argument("--live", action="store_true", help="Call the real Groq API (needs GROQ_API_KEY)")
+    args = parser.parse_args()
+    
+    if not args.live:
+        os.environ.setdefault("GROQ_API_KEY", "benchmark-placeholder")
+    
+    from llm_service import GroqLLMService
+    service = GroqLLMService()
+    if not args.live:
+        service.client = _simulated_client(args.latency, is_async=False)
+        service.async_client = _simulated_client(args.latency, is_async=True)
+    
+    print(f"📊 {args.questions} concurrent questions, probe every {args.interval * 1000:.0f} ms"
+          f" ({'live Groq' if args.live else f'simulated {args.latency}s LLM'})\n")
+    print(f"{'mode':<10}{'wall (s)':>10}{'ticks':>8}{'p50 lag (ms)':>15}{'p99 lag (ms)':>15}{'max lag (ms)':>15}")
+    for mode in ("blocking", "async"):
+        r = asyncio.run(run_mode(service, mode, args.questions, args.interval))
+        service._semaphore = None  # Each asyncio.run gets a fresh loop
+        print(f"{r['mode']:<10}{r['wall_s']:>10.2f}{r['ticks']:>8}{r['lag_p50_ms']:>15.1f}"
+              f"{r['lag_p99_ms']:>15.1f}{r['lag_max_ms']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+CPU embedding throughput of the evidence embedding pipeline
+
+Encodes synthetic evidence chunks (about --chunk-chars characters each, like
+the 1000-character splitter output) and reports chunks/sec for each corpus
+size, batch size and thread count:
+
+    python benchmarks/embedding_throughput.py --sizes 1000,10000,100000 \\
+        --batch-sizes 32,64,128 --threads 4,8
+
+--compare-langchain also times LangChain's HuggingFaceEmbeddings, the path
+EvidenceManager used before, on the same texts.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embedding_pipeline import EmbeddingPipeline  # noqa: E402
+from evidence_service import EMBEDDING_MODEL_NAME  # noqa: E402
+
+WORDS = (
+    "the accused stated before the magistrate that on the night of the incident he was at his residence "
+    "and the complainant alleged that the amount was transferred under section 420 of the penal code "
+    "as recorded in the first information report filed at the police station with the bank statement"
+).split()
+
+
+def make_chunks(count: int, chunk_chars: int, seed: int = 7):
+    rng = random.Random(seed)
+    chunks = []
+    for i in range(count):
+        words, length = [f"Exhibit {i}:"], 0
+        target = int(chunk_chars * rng.uniform(0.5, 1.0))  # Splitter chunks vary in length
+        while length < target:
+            word = rng.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        chunks.append(" ".join(words))
+    return chunks
+
+
+def measure(embed, texts):
+    started = time.perf_counter()
+    vectors = embed(texts)
+    elapsed = time.perf_counter() - started
+    assert len(vectors) == len(texts)
+    return len(texts) / elapsed, elapsed
+
+
+def main(args):
+    sizes = [int(n) for n in args.sizes.split(",")]
+    batch_sizes = [int(n) for n in args.batch_sizes.split(",")]
+    thread_counts = [int(n) for n in args.threads.split(",")]
+    corpus = make_chunks(max(sizes), args.chunk_chars)
+
+    print(f"📊 {EMBEDDING_MODEL_NAME} on CPU, ~{args.chunk_chars} chars/chunk, {os.cpu_count()} cores")
+    print(f"   {'path':<28}{'chunks':>9}{'chunks/sec':>13}{'elapsed':>11}")
+
+    pipeline = EmbeddingPipeline(EMBEDDING_MODEL_NAME, threads=max(thread_counts)).load()
+    pipeline.embed(corpus[:min(256, len(corpus))])  # Warm up
+    import torch
+    for threads in thread_counts:
+        torch.set_num_threads(threads)
+        for batch_size in batch_sizes:
+            pipeline.batch_size = batch_size
+            for size in sizes:
+                rate, elapsed = measure(pipeline.embed_documents, corpus[:size])
+                label = f"pipeline b={batch_size} t={threads}"
+                print(f"   {label:<28}{size:>9}{rate:>13.1f}{elapsed:>10.1f}s")
+
+    if args.compare_langchain:
+        from langchain_huggingface import HuggingFaceEmbeddings
+        baseline = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_NAME)
+        baseline.embed_documents(corpus[:min(256, len(corpus))])
+        for size in sizes:
+            rate, elapsed = measure(baseline.embed_documents, corpus[:size])
+            print(f"   {'langchain default':<28}{size:>9}{rate:>13.1f}{elapsed:>10.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--batch-sizes", default="64")
+    parser.add_argument("--threads", default=str(os.cpu_count() or 1))
+    parser.add_argument("--chunk-chars", type=int, default=1000)
+    parser.add_argument("--compare-langchain", action="store_true")
+    main(parser.parse_args())
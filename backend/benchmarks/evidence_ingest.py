@@ -0,0 +1,89 @@
+"""
+Evidence ingest cost as a case grows
+
+Uploads --exhibits synthetic exhibits one at a time and times the indexing
+step after each upload, comparing:
+
+    rebuild      re-embed every chunk of every exhibit (the old behaviour)
+    incremental  embed and add only the new exhibit's chunks
+
+By default a synthetic embedder costs --ms-per-chunk per chunk, so the run
+needs only numpy and faiss; pass --real-model to use all-MiniLM-L6-v2.
+
+    python benchmarks/evidence_ingest.py --exhibits 50 --chunks-per-exhibit 40
+"""
+
+import os
+import sys
+import time
+import hashlib
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from evidence_service import EvidenceManager, get_embeddings  # noqa: E402
+
+
+class SyntheticEmbeddings:
+    """Deterministic 384-d vectors at a fixed CPU cost per chunk"""
+    def __init__(self, ms_per_chunk: float, dimension: int = 384):
+        self.ms_per_chunk = ms_per_chunk
+        self.dimension = dimension
+
+    def _vector(self, text):
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        return np.random.default_rng(seed).standard_normal(self.dimension, dtype=np.float32)
+
+    def embed_documents(self, texts):
+        deadline = time.perf_counter() + len(texts) * self.ms_per_chunk / 1000
+        vectors = [self._vector(text) for text in texts]
+        while time.perf_counter() < deadline:
+            pass  # Burn CPU like a model forward pass would
+        return np.vstack(vectors) if vectors else np.zeros((0, self.dimension), dtype=np.float32)
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def exhibit_chunks(exhibit: int, count: int):
+    return [f"Exhibit {exhibit}, paragraph {i}: statement recorded under section {400 + i % 50}." for i in range(count)]
+
+
+def run(mode: str, embeddings, exhibits: int, chunks_per_exhibit: int):
+    manager = EvidenceManager(index_dir=None, embedding_cache=None)
+    manager.embeddings = embeddings
+    timings = []
+    for exhibit in range(exhibits):
+        manager._add_chunks(exhibit_chunks(exhibit, chunks_per_exhibit), f"exhibit_{exhibit}.pdf")
+        started = time.perf_counter()
+        if mode == "rebuild":
+            manager.rebuild_vector_store()
+        else:
+            manager.build_vector_store()
+        timings.append(time.perf_counter() - started)
+    assert len(manager.vector_store) == exhibits * chunks_per_exhibit
+    return timings
+
+
+def main(args):
+    embeddings = get_embeddings() if args.real_model else SyntheticEmbeddings(args.ms_per_chunk)
+    checkpoints = sorted({1, max(1, args.exhibits // 4), max(1, args.exhibits // 2), args.exhibits})
+
+    print(f"📊 {args.exhibits} exhibits x {args.chunks_per_exhibit} chunks "
+          f"({'all-MiniLM-L6-v2' if args.real_model else f'synthetic {args.ms_per_chunk} ms/chunk'})")
+    print(f"   {'mode':<12}" + "".join(f"{'upload #' + str(n):>14}" for n in checkpoints) + f"{'total':>12}")
+    for mode in ("rebuild", "incremental"):
+        timings = run(mode, embeddings, args.exhibits, args.chunks_per_exhibit)
+        cells = "".join(f"{timings[n - 1] * 1000:>11.0f} ms" for n in checkpoints)
+        print(f"   {mode:<12}{cells}{sum(timings):>10.1f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--exhibits", type=int, default=50)
+    parser.add_argument("--chunks-per-exhibit", type=int, default=40)
+    parser.add_argument("--ms-per-chunk", type=float, default=1.0)
+    parser.add_argument("--real-model", action="store_true")
+    main(parser.parse_args())
@@ -0,0 +1,127 @@
+"""
+Evidence search: latency and recall@k of vector-only, lexical-only and hybrid
+retrieval
+
+Builds a synthetic case file of witness statements, each naming a witness,
+an FIR number, an IPC section and one of a few events, then runs three kinds
+of query against it:
+
+    identifier   "FIR 1234/2024", "Section 420"  (exact tokens)
+    name         "statement of Priya Sharma"
+    semantic     paraphrase of an event, sharing no words with it
+
+Recall@k is the share of the top k that is relevant, out of
+min(k, relevant chunks). Query latency includes the query embedding
+(the embedding cache is off). The vector numbers only mean something with
+the real model; --synthetic swaps in random vectors to time the rest.
+
+    python benchmarks/evidence_search.py --chunks 5000 -k 5
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from evidence_service import EvidenceManager, get_embeddings  # noqa: E402
+from benchmarks.evidence_ingest import SyntheticEmbeddings  # noqa: E402
+
+FIRST_NAMES = ["Priya", "Ramesh", "Anita", "Suresh", "Kavita", "Arjun", "Meena", "Vikram", "Lakshmi", "Farhan"]
+LAST_NAMES = ["Sharma", "Iyer", "Reddy", "Khan", "Nair", "Patel", "Das", "Gupta", "Menon", "Singh"]
+SECTIONS = [302, 307, 323, 354, 379, 392, 406, 420, 467, 506]
+EVENTS = [
+    ("saw a white car drive away from the bank at high speed", "which vehicle fled the robbery"),
+    ("heard the accused threaten to kill the complainant", "death threats made against the victim"),
+    ("found the forged cheque book in the accused's desk drawer", "where were the counterfeit bank documents discovered"),
+    ("was paid cash to sign the property transfer papers", "bribery over land registration"),
+    ("noticed the shop lock had been broken open at night", "evidence of burglary after dark"),
+    ("treated the victim for head injuries at the hospital", "medical care given for wounds to the skull"),
+]
+
+
+def build_corpus(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    chunks = []
+    for i in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        fir = f"{1000 + i}/{rng.choice([2022, 2023, 2024])}"
+        section = rng.choice(SECTIONS)
+        event = rng.randrange(len(EVENTS))
+        chunks.append({
+            "text": (f"Statement of {name} recorded in FIR {fir} under Section {section} IPC. "
+                     f"The witness {EVENTS[event][0]}. The statement was read over and signed."),
+            "name": name, "fir": fir, "section": section, "event": event
+        })
+    return chunks
+
+
+def build_queries(corpus, count: int, seed: int = 11):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        target = rng.choice(corpus)
+        kind = rng.choice(["identifier", "name", "semantic"])
+        if kind == "identifier" and rng.random() < 0.5:
+            text, relevant = f"FIR {target['fir']}", lambda c, t=target: c["fir"] == t["fir"]
+        elif kind == "identifier":
+            text, relevant = f"Section {target['section']}", lambda c, t=target: c["section"] == t["section"]
+        elif kind == "name":
+            text, relevant = f"statement of {target['name']}", lambda c, t=target: c["name"] == t["name"]
+        else:
+            text, relevant = EVENTS[target["event"]][1], lambda c, t=target: c["event"] == t["event"]
+        queries.append((kind, text, {i for i, c in enumerate(corpus) if relevant(c)}))
+    return queries
+
+
+def run(manager, corpus_ids, queries, mode: str, k: int):
+    by_kind = {}
+    latencies = []
+    for kind, text, relevant in queries:
+        started = time.perf_counter()
+        results = manager.search_evidence(text, k=k, mode=mode)
+        latencies.append(time.perf_counter() - started)
+        hits = sum(1 for r in results if corpus_ids[r["content"]] in relevant)
+        by_kind.setdefault(kind, []).append(hits / min(k, len(relevant)))
+    latencies.sort()
+    return {
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "recall": {kind: statistics.mean(values) for kind, values in by_kind.items()}
+    }
+
+
+def main(args):
+    embeddings = SyntheticEmbeddings(args.ms_per_query) if args.synthetic else get_embeddings()
+    corpus = build_corpus(args.chunks)
+    queries = build_queries(corpus, args.queries)
+
+    manager = EvidenceManager(index_dir=None, embedding_cache=None)
+    manager.embeddings = embeddings
+    manager._add_chunks([c["text"] for c in corpus], "case_file.pdf")
+    manager.build_vector_store()
+    corpus_ids = {c["text"]: i for i, c in enumerate(corpus)}
+
+    skipped = sum(1 for _, text, _ in queries if manager.search_evidence(text, k=args.k, mode="hybrid")[0]["match"] == "lexical")
+    print(f"📊 {args.chunks} chunks, {args.queries} queries, k={args.k} "
+          f"({'synthetic vectors' if args.synthetic else 'all-MiniLM-L6-v2'})")
+    print(f"   {'mode':<10}{'mean':>10}{'p95':>10}{'identifier':>13}{'name':>8}{'semantic':>10}")
+    for mode in ("vector", "lexical", "hybrid"):
+        result = run(manager, corpus_ids, queries, mode, args.k)
+        recall = result["recall"]
+        print(f"   {mode:<10}{result['mean_ms']:>7.2f} ms{result['p95_ms']:>7.2f} ms"
+              f"{recall.get('identifier', 0):>13.2f}{recall.get('name', 0):>8.2f}{recall.get('semantic', 0):>10.2f}")
+    print(f"   hybrid answered {skipped}/{args.queries} queries without embedding them")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--ms-per-query", type=float, default=5.0)
+    main(parser.parse_args())
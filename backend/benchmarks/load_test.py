@@ -0,0 +1,126 @@
+"""
+Offline load test for the whole FastAPI app
+
+Start the fake upstreams and the backend, then run this against it:
+
+    uvicorn fake_servers:app --port 9000 &
+    LLM_BASE_URL=http://localhost:9000 GROQ_API_KEY=fake \\
+    DEEPGRAM_BASE_URL=http://localhost:9000 DEEPGRAM_API_KEY=fake \\
+    uvicorn main:app --port 8000 &
+    python benchmarks/load_test.py --clients 50 --duration 30 --transcribe-sessions 10
+
+(or skip the fake server and start the backend with LLM_PROVIDER=fake
+ASR_PROVIDER=fake for purely in-process fakes)
+
+Each client loops on POST /chat or POST /chat/stream for --duration seconds.
+Optional transcription sessions stream synthetic 16 kHz PCM at real-time
+pace over /ws/transcribe in the background. Reports throughput, latency
+percentiles and, for streaming, time to first token.
+"""
+
+import time
+import json
+import asyncio
+import argparse
+import statistics
+
+import httpx
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def chat_client(client, base_url, client_id, deadline, stream, unique, results):
+    i = 0
+    while time.perf_counter() < deadline:
+        i += 1
+        question = f"What did witness {client_id}-{i} say about the alibi?" if unique else "What did the defence say about the alibi?"
+        started = time.perf_counter()
+        try:
+            if stream:
+                first_token = None
+                async with client.stream("POST", f"{base_url}/chat/stream", json={"message": question}) as response:
+                    async for line in response.aiter_lines():
+                        if first_token is None and line.startswith("data: "):
+                            first_token = time.perf_counter() - started
+                results["ttft"].append(first_token or 0.0)
+            else:
+                response = await client.post(f"{base_url}/chat", json={"message": question})
+                response.raise_for_status()
+            results["latency"].append(time.perf_counter() - started)
+        except Exception as e:
+            results["errors"] += 1
+            print(f"⚠️ Client {client_id}: {e}")
+
+
+async def transcribe_session(base_url, meeting_id, user_id, deadline, counters):
+    """Stream silence-shaped PCM at real time so the backend carries audio load"""
+    import websockets
+    ws_url = base_url.replace("http://", "ws://").replace("https://", "wss://")
+    chunk = b"\x00\x01" * 2048  # 2048 samples = 128 ms at 16 kHz
+    try:
+        async with websockets.connect(f"{ws_url}/ws/transcribe/{meeting_id}/{user_id}") as ws:
+            async def drain():
+                async for message in ws:
+                    if json.loads(message).get("type") == "interim":
+                        counters["interim"] += 1
+            reader = asyncio.create_task(drain())
+            while time.perf_counter() < deadline:
+                await ws.send(chunk)
+                counters["audio_chunks"] += 1
+                await asyncio.sleep(0.128)
+            reader.cancel()
+    except Exception as e:
+        print(f"⚠️ Transcription session: {e}")
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.clients + 10)
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        # A meeting for the transcription sessions
+        sessions = []
+        if args.transcribe_sessions:
+            host = (await client.post(f"{args.base_url}/auth/login", json={"name": "Load Host", "role": "Judge"})).json()
+            meeting = (await client.post(f"{args.base_url}/meeting/create", json={"user_id": host["user_id"]})).json()
+            for i in range(args.transcribe_sessions):
+                user = (await client.post(f"{args.base_url}/auth/login", json={"name": f"Speaker {i}", "role": "Lawyer"})).json()
+                await client.post(f"{args.base_url}/meeting/join", json={"meeting_id": meeting["meeting_id"], "user_id": user["user_id"]})
+                sessions.append((meeting["meeting_id"], user["user_id"]))
+
+        results = {"latency": [], "ttft": [], "errors": 0}
+        counters = {"audio_chunks": 0, "interim": 0}
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *[chat_client(client, args.base_url, i, deadline, args.stream, args.unique, results) for i in range(args.clients)],
+            *[transcribe_session(args.base_url, m, u, deadline, counters) for m, u in sessions]
+        )
+        elapsed = time.perf_counter() - started
+
+    latencies = results["latency"]
+    print(f"\n📊 {args.clients} chat clients ({'SSE' if args.stream else 'JSON'}), "
+          f"{args.transcribe_sessions} transcription sessions, {elapsed:.1f}s")
+    print(f"   requests:   {len(latencies)} ok, {results['errors']} errors, {len(latencies) / elapsed:.1f} req/s")
+    if latencies:
+        print(f"   latency:    p50 {percentile(latencies, 50) * 1000:.0f} ms | p95 {percentile(latencies, 95) * 1000:.0f} ms"
+              f" | p99 {percentile(latencies, 99) * 1000:.0f} ms | max {max(latencies) * 1000:.0f} ms"
+              f" | mean {statistics.mean(latencies) * 1000:.0f} ms")
+    if results["ttft"]:
+        print(f"   first token: p50 {percentile(results['ttft'], 50) * 1000:.0f} ms | p99 {percentile(results['ttft'], 99) * 1000:.0f} ms")
+    if sessions:
+        print(f"   audio:      {counters['audio_chunks']} chunks sent, {counters['interim']} interim results received")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--stream", action="store_true", help="Use POST /chat/stream and measure time to first token")
+    parser.add_argument("--unique", action="store_true", help="Ask a different question every time (defeats the answer cache)")
+    parser.add_argument("--transcribe-sessions", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,79 @@
+"""
+Vector index modes: build time, query latency, recall@k and memory per vector
+of the flat, HNSW and IVF-PQ evidence indexes
+
+Vectors are clustered Gaussians shaped like 384-d sentence embeddings. Recall
+is measured against exact (flat) search. IVF-PQ is run twice: with its PQ
+distances only, and re-ranked against exact vectors (as EvidenceManager does
+from its memory-mapped segments on disk).
+
+    python benchmarks/vector_index_modes.py --vectors 200000
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vector_index  # noqa: E402
+from vector_index import VectorIndex  # noqa: E402
+
+
+def clustered_vectors(count: int, dimension: int, clusters: int, seed: int):
+    rng = np.random.default_rng(seed)
+    centers = np.random.default_rng(0).standard_normal((clusters, dimension)).astype(np.float32)
+    return (centers[rng.integers(0, clusters, count)] + 0.3 * rng.standard_normal((count, dimension))).astype(np.float32)
+
+
+def build(index_type: str, vectors: np.ndarray, batch: int, lookup=None):
+    index = VectorIndex(index_type, vector_lookup=lookup)
+    started = time.perf_counter()
+    for start in range(0, len(vectors), batch):
+        index.add(list(range(start, min(start + batch, len(vectors)))), vectors[start:start + batch])
+    return index, time.perf_counter() - started
+
+
+def measure(index: VectorIndex, queries: np.ndarray, truth, k: int):
+    started = time.perf_counter()
+    found = [[chunk_id for chunk_id, _ in index.search(query, k)] for query in queries]
+    latency = (time.perf_counter() - started) / len(queries)
+    recall = np.mean([len(set(f) & t) / k for f, t in zip(found, truth)])
+    return latency, recall
+
+
+def main(args):
+    vectors = clustered_vectors(args.vectors, args.dimension, args.clusters, seed=1)
+    queries = clustered_vectors(args.queries, args.dimension, args.clusters, seed=2)
+    print(f"📊 {args.vectors} x {args.dimension}-d vectors, {args.queries} queries, recall@{args.k} vs exact")
+    print(f"   {'mode':<16}{'build':>10}{'query':>11}{'recall':>9}{'bytes/vector':>15}")
+
+    flat, seconds = build("flat", vectors, args.batch)
+    truth = [{chunk_id for chunk_id, _ in flat.search(query, args.k)} for query in queries]
+    runs = [("flat", flat, seconds)]
+    runs.append(("hnsw", *build("hnsw", vectors, args.batch)))
+    ivfpq, seconds = build("ivfpq", vectors, args.batch)
+    runs.append(("ivfpq", ivfpq, seconds))
+    rerank, _ = build("ivfpq", vectors[:0], args.batch)  # Same trained index, re-ranked below
+    rerank.load_trained(ivfpq.trained_state())
+    rerank.add(list(range(len(vectors))), vectors)
+    rerank.vector_lookup = lambda ids: vectors[ids]
+    runs.append((f"ivfpq+rerank{vector_index.IVF_REFINE}", rerank, seconds))
+
+    for name, index, seconds in runs:
+        latency, recall = measure(index, queries, truth, args.k)
+        print(f"   {name:<16}{seconds:>8.1f} s{latency * 1000:>8.2f} ms{recall:>9.3f}{index.bytes_per_vector():>15.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=5000, help="vectors per add(), like one upload")
+    parser.add_argument("-k", type=int, default=10)
+    main(parser.parse_args())
@@ -0,0 +1,126 @@
+"""
+Blob Store
+Content-addressed storage for uploaded evidence files on local disk
+
+Each file is stored once under the SHA-256 of its bytes, sharded into 256
+sub-directories. Uploads are copied in fixed-size chunks while hashing, so a
+file is never held in memory whole; only {sha256, size} is kept in RAM.
+"""
+
+import os
+import shutil
+import hashlib
+import tempfile
+import threading
+from io import BytesIO
+from typing import BinaryIO, Dict
+
+EVIDENCE_BLOB_DIR = os.getenv("EVIDENCE_BLOB_DIR", "evidence_blobs")
+COPY_CHUNK_BYTES = 1024 * 1024
+
+# Blob path -> uploads holding it until they are ingested. Shared by every store
+# (as is the lock), since a meeting shard's store is recreated when it reloads
+_holds: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+class BlobStore:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._tmp_dir = os.path.join(directory, "tmp")
+        os.makedirs(self._tmp_dir, exist_ok=True)
+        self._lock = _lock
+
+    def path(self, sha256: str) -> str:
+        return os.path.join(self.directory, sha256[:2], sha256)
+
+    def exists(self, sha256: str) -> bool:
+        return os.path.exists(self.path(sha256))
+
+    def put_stream(self, stream: BinaryIO, hold: bool = False) -> Dict:
+        """
+        Copy a file object into the store; returns {"sha256", "size"}. With
+        hold=True the blob is also held (see hold()) before anyone can delete it.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self._tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = stream.read(COPY_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            sha256 = digest.hexdigest()
+            final_path = self.path(sha256)
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            with self._lock:
+                if os.path.exists(final_path):
+                    os.remove(tmp_path)  # Same bytes already stored
+                else:
+                    os.replace(tmp_path, final_path)
+                if hold:
+                    _holds[final_path] = _holds.get(final_path, 0) + 1
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return {"sha256": sha256, "size": size}
+
+    def put_bytes(self, data: bytes) -> Dict:
+        return self.put_stream(BytesIO(data))
+
+    def open(self, sha256: str) -> BinaryIO:
+        return open(self.path(sha256), "rb")
+
+    def read(self, sha256: str) -> bytes:
+        with self.open(sha256) as f:
+            return f.read()
+
+    def hold(self, sha256: str):
+        """Keep the blob on disk (delete() skips it) until as many unhold() calls"""
+        with self._lock:
+            path = self.path(sha256)
+            _holds[path] = _holds.get(path, 0) + 1
+
+    def unhold(self, sha256: str):
+        with self._lock:
+            path = self.path(sha256)
+            if _holds.get(path, 0) > 1:
+                _holds[path] -= 1
+            else:
+                _holds.pop(path, None)
+
+    def delete(self, sha256: str):
+        """Delete the blob, unless an upload still holds it"""
+        with self._lock:
+            if self.path(sha256) in _holds:
+                return
+            try:
+                os.remove(self.path(sha256))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """Delete every blob, except those uploads still hold"""
+        with self._lock:
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if not (os.path.isdir(path) and len(name) == 2):  # Hash shards only
+                    continue
+                if not any(os.path.dirname(held) == path for held in _holds):
+                    shutil.rmtree(path, ignore_errors=True)
+                    continue
+                for sha256 in os.listdir(path):
+                    if os.path.join(path, sha256) not in _holds:
+                        try:
+                            os.remove(os.path.join(path, sha256))
+                        except FileNotFoundError:
+                            pass
+
+
+# Global instance
+evidence_blob_store = BlobStore(EVIDENCE_BLOB_DIR)
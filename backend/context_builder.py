@@ -0,0 +1,205 @@
+"""
+Chat Context Builder
+Packs transcript, evidence and criminal records into a token budget for LLM questions
+"""
+
+import os
+import re
+from typing import Dict, List, Optional
+
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", "6000"))
+
+# Share of the budget reserved for the most recent speech before evidence and
+# records are considered; whatever they leave over goes to older speech
+RECENT_SPEECH_SHARE = 0.6
+
+RECORDS_HEADER = "CRIMINAL RECORDS (name | status | crime | year | details):"
+EVIDENCE_HEADER = "RELEVANT EVIDENCE:"
+SUMMARY_HEADER = "SUMMARY OF EARLIER PROCEEDINGS:"
+TRANSCRIPT_HEADER = "TRANSCRIPT (HH:MM:SS Speaker: text; '…' = same speaker as previous line):"
+
+
+class TokenCounter:
+    """Counts tokens locally with tiktoken, falling back to a word/punctuation estimate"""
+    def __init__(self):
+        self._encoding = None
+        try:
+            import tiktoken
+            self._encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            # Not installed, or the encoding file can't be fetched offline
+            self._encoding = None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        # Llama/GPT BPE averages a little over one token per word or symbol
+        return int(len(re.findall(r"\w+|[^\w\s]", text)) * 1.3) + 1
+
+
+def compact_time(timestamp: str) -> str:
+    """'2025-01-04T14:05:09.123456' -> '14:05:09'"""
+    if "T" in timestamp:
+        return timestamp.split("T", 1)[1][:8]
+    return timestamp[:8]
+
+
+class ChatContext:
+    def __init__(self, text: str, usage: Dict):
+        self.text = text
+        self.usage = usage
+
+
+class ChatContextBuilder:
+    def __init__(self, token_budget: int = CHAT_CONTEXT_TOKEN_BUDGET, counter: Optional[TokenCounter] = None):
+        self.token_budget = token_budget
+        self.counter = counter or TokenCounter()
+
+    def _transcript_lines(self, transcript: List[Dict]) -> List[tuple]:
+        """
+        One compact line per entry: 'HH:MM:SS Speaker: text'. Consecutive
+        entries from the same speaker drop the repeated label. Returns
+        (compact line, fully labelled line) pairs so a window that starts
+        mid-run can restore the label.
+        """
+        lines = []
+        previous_speaker = None
+        for entry in transcript:
+            speaker = entry.get("speaker", "Speaker")
+            time = compact_time(entry.get("timestamp", ""))
+            labelled = f"{time} {speaker}: {entry.get('text', '')}"
+            if speaker == previous_speaker:
+                lines.append((f"{time} …: {entry.get('text', '')}", labelled))
+            else:
+                lines.append((labelled, labelled))
+            previous_speaker = speaker
+        return lines
+
+    def build(self, transcript: List[Dict], evidence_results: Optional[List[Dict]] = None,
+              records: Optional[List[Dict]] = None, session_summary: Optional[Dict] = None) -> ChatContext:
+        """
+        Fill the budget by priority (recent speech, top evidence, matched
+        records, session summary, then older speech) but always emit sections
+        in the same order: records, evidence, summary, transcript. Stable,
+        slow-changing sections come first so consecutive prompts share the
+        longest possible prefix. Headers and separators are paid for first,
+        so the whole text stays within the budget.
+        """
+        evidence_results = evidence_results or []
+        records = records or []
+        lines = self._transcript_lines(transcript)
+        has_summary = bool(session_summary and session_summary.get("text"))
+
+        # Headers of every section that may appear, each with its "\n" and "\n\n" separators
+        overhead = sum(self.counter.count(header) + 3 for header, present in (
+            (RECORDS_HEADER, records),
+            (EVIDENCE_HEADER, evidence_results),
+            (SUMMARY_HEADER, has_summary),
+            (f"{TRANSCRIPT_HEADER}\n[{len(lines)} earlier statements omitted]", lines)
+        ) if present)
+        remaining = self.token_budget - overhead
+
+        # Newest speech first, until its reserved share is used up
+        line_tokens = [self.counter.count(labelled) + 1 for _, labelled in lines]
+        first_included = len(lines)
+        transcript_tokens = 0
+        speech_budget = int(max(0, remaining) * RECENT_SPEECH_SHARE)
+        while first_included > 0 and transcript_tokens + line_tokens[first_included - 1] <= speech_budget:
+            first_included -= 1
+            transcript_tokens += line_tokens[first_included]
+        remaining -= transcript_tokens
+
+        # Evidence in relevance order
+        evidence_blocks = []
+        evidence_tokens = 0
+        for result in evidence_results:
+            source = f"{result['filename']}, p. {result['page']}" if result.get("page") else result['filename']
+            block = f"[{source}] {result['content'].strip()}"
+            tokens = self.counter.count(block) + 1
+            if tokens > remaining:
+                continue
+            evidence_blocks.append(block)
+            evidence_tokens += tokens
+            remaining -= tokens
+
+        # Matched criminal records
+        record_lines = []
+        records_tokens = 0
+        for record in records:
+            line = f"{record['name']} | {record['status']} | {record['crime']} | {record['year']} | {record['details']}"
+            tokens = self.counter.count(line) + 1
+            if tokens > remaining:
+                continue
+            record_lines.append(line)
+            records_tokens += tokens
+            remaining -= tokens
+
+        # Summary of earlier proceedings, only needed when speech was cut
+        summary_text = ""
+        summary_tokens = 0
+        if first_included > 0 and has_summary:
+            tokens = self.counter.count(session_summary["text"]) + 1
+            if tokens <= remaining:
+                summary_text = session_summary["text"]
+                summary_tokens = tokens
+                remaining -= tokens
+
+        # Leftover budget goes to progressively older speech
+        while first_included > 0 and line_tokens[first_included - 1] <= remaining:
+            first_included -= 1
+            transcript_tokens += line_tokens[first_included]
+            remaining -= line_tokens[first_included]
+
+        text = self._render(record_lines, evidence_blocks, summary_text, lines, first_included)
+        total_tokens = self.counter.count(text)
+        # Tokens of joined pieces can differ slightly from their sum: drop the
+        # oldest speech (then the least relevant evidence and records) until it fits
+        while total_tokens > self.token_budget and (first_included < len(lines) or evidence_blocks or record_lines):
+            if first_included < len(lines):
+                transcript_tokens -= line_tokens[first_included]
+                first_included += 1
+            elif evidence_blocks:
+                evidence_tokens -= self.counter.count(evidence_blocks.pop()) + 1
+            else:
+                records_tokens -= self.counter.count(record_lines.pop()) + 1
+            text = self._render(record_lines, evidence_blocks, summary_text, lines, first_included)
+            total_tokens = self.counter.count(text)
+
+        usage = {
+            "budget": self.token_budget,
+            "total_tokens": total_tokens,
+            "transcript_tokens": transcript_tokens,
+            "evidence_tokens": evidence_tokens,
+            "records_tokens": records_tokens,
+            "summary_tokens": summary_tokens,
+            "transcript_lines": len(lines) - first_included,
+            "transcript_lines_omitted": first_included,
+            "evidence_chunks": len(evidence_blocks),
+            "records": len(record_lines)
+        }
+        return ChatContext(text, usage)
+
+    @staticmethod
+    def _render(record_lines: List[str], evidence_blocks: List[str], summary_text: str,
+                lines: List[tuple], first_included: int) -> str:
+        sections = []
+        if record_lines:
+            sections.append(RECORDS_HEADER + "\n" + "\n".join(record_lines))
+        if evidence_blocks:
+            sections.append(EVIDENCE_HEADER + "\n" + "\n\n".join(evidence_blocks))
+        if summary_text:
+            sections.append(SUMMARY_HEADER + "\n" + summary_text)
+        if first_included < len(lines):
+            header = TRANSCRIPT_HEADER
+            if first_included > 0:
+                header += f"\n[{first_included} earlier statements omitted]"
+            window = [compact for compact, _ in lines[first_included:]]
+            window[0] = lines[first_included][1]
+            sections.append(header + "\n" + "\n".join(window))
+        return "\n\n".join(sections)
+
+
+# Global instance
+chat_context_builder = ChatContextBuilder()
@@ -3,6 +3,7 @@ from typing import List, Dict, Optional
 
 class CriminalRecordsManager:
     def __init__(self):
+        self.revision = 0  # Bumped on every change to the records
         self.records = [
             {
                 "name": "Vikram Singh",
@@ -49,6 +50,16 @@ class CriminalRecordsManager:
                 return record
         return None
     
+    def find_mentioned_records(self, text: str) -> List[Dict]:
+        """Records whose full name, first name or surname appears in the text"""
+        text_lower = text.lower()
+        matched = []
+        for record in self.records:
+            name_parts = [record["name"].lower()] + [part for part in record["name"].lower().split() if len(part) > 2]
+            if any(part in text_lower for part in name_parts):
+                matched.append(record)
+        return matched
+    
     def get_all_records(self) -> List[Dict]:
         """Get all criminal records"""
         return self.records
@@ -66,6 +77,7 @@ class CriminalRecordsManager:
         required_fields = ["name", "status", "crime", "year", "details"]
         if all(field in record for field in required_fields):
             self.records.append(record)
+            self.revision += 1
             return True
         return False
     
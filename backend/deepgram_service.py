@@ -13,7 +13,9 @@ class DeepgramTranscriber:
         if not self.api_key:
             raise ValueError("DEEPGRAM_API_KEY not found in environment")
         
-        self.ws_url = "wss://api.deepgram.com/v1/listen"
+        # DEEPGRAM_BASE_URL lets the backend talk to a local fake (see fake_servers.py)
+        self.base_url = os.getenv("DEEPGRAM_BASE_URL", "https://api.deepgram.com").rstrip("/")
+        self.ws_url = self.base_url.replace("https://", "wss://").replace("http://", "ws://") + "/v1/listen"
         self.connection = None
     
     async def connect(self):
@@ -60,7 +62,7 @@ class DeepgramTranscriber:
     
     def transcribe_file(self, audio_data, filename="audio"):
         """Transcribe audio file (non-streaming) - for uploaded audio files"""
-        url = "https://api.deepgram.com/v1/listen"
+        url = f"{self.base_url}/v1/listen"
         
         # Detect content type from filename
         content_type = "audio/wav"
@@ -0,0 +1,128 @@
+"""
+Disk Cache
+Content-addressed, size-bounded key/value store on the local filesystem
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Optional
+
+# Root for every on-disk cache, relative to the backend's working directory
+CACHE_DIR = os.getenv("CACHE_DIR", "cache")
+
+
+class DiskCache:
+    """
+    Stores each value in its own file named by the SHA-256 of its key, sharded
+    into 256 sub-directories. Writes are atomic (temp file + rename), reads
+    refresh the file's mtime, and the least recently used files are deleted
+    once the directory grows past `max_bytes`. Survives restarts; safe to use
+    from several threads. The size of what earlier runs left behind is summed
+    in a background thread, so opening a large cache does not block; nothing
+    is evicted until that scan finishes.
+    """
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self.total_bytes = 0  # Bytes written by this run until the scan adds the rest
+        self.scanned = False
+        threading.Thread(target=self._scan, name="disk-cache-scan", daemon=True).start()
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def _files(self):
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".tmp"):
+                    yield os.path.join(root, name)
+
+    def _scan(self):
+        existing = 0
+        for path in self._files():
+            try:
+                existing += os.path.getsize(path)
+            except FileNotFoundError:
+                continue
+        with self._lock:
+            self.total_bytes += existing
+            self.scanned = True
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = f.read()
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(value)
+        with self._lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self.total_bytes += len(value) - previous
+            if self.scanned and self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete least recently used files until back under 90% of the limit"""
+        target = int(self.max_bytes * 0.9)
+        entries = []
+        for path in self._files():
+            try:
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except FileNotFoundError:
+                continue
+        # Recount from the walk: files written while the scan ran may have been counted twice
+        self.total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self.total_bytes <= target:
+                break
+            try:
+                os.remove(path)
+                self.total_bytes -= size
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+
+    def get_json(self, key: str):
+        value = self.get(key)
+        return json.loads(value) if value is not None else None
+
+    def put_json(self, key: str, value):
+        self.put(key, json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "directory": self.directory,
+            "bytes": self.total_bytes,
+            "size_scanned": self.scanned,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
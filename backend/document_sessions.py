@@ -0,0 +1,128 @@
+"""
+Document Sessions
+Server-side chunked and embedded copies of analyzed legal documents, so
+follow-up questions send only a document ID and get the most relevant passages
+"""
+
+import os
+import re
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from legal_document_analyzer import normalize_document
+from evidence_service import get_embeddings
+
+DOCUMENT_SESSIONS_MAX = int(os.getenv("DOCUMENT_SESSIONS_MAX", "200"))
+DOCUMENT_SESSION_TTL_SECONDS = float(os.getenv("DOCUMENT_SESSION_TTL_SECONDS", str(6 * 3600)))
+DOCUMENT_QA_TOP_K = int(os.getenv("DOCUMENT_QA_TOP_K", "4"))
+
+
+class DocumentSession:
+    def __init__(self, document_id: str, text: str, chunks: List[str], vectors: Optional[np.ndarray]):
+        self.document_id = document_id
+        self.text = text
+        self.chunks = chunks
+        self.vectors = vectors  # Unit-length rows, one per chunk (None if embedding failed)
+        self.last_used = time.monotonic()
+
+
+class DocumentSessionStore:
+    def __init__(self, embeddings_factory: Callable, max_sessions: int = DOCUMENT_SESSIONS_MAX,
+                 ttl_seconds: float = DOCUMENT_SESSION_TTL_SECONDS):
+        self.embeddings_factory = embeddings_factory
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, DocumentSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._splitter = None
+
+    def _split(self, text: str) -> List[str]:
+        if self._splitter is None:
+            from langchain_text_splitters import RecursiveCharacterTextSplitter
+            self._splitter = RecursiveCharacterTextSplitter(chunk_size=1200, chunk_overlap=150)
+        return self._splitter.split_text(text)
+
+    def _embed(self, texts: List[str], query: bool = False) -> Optional[np.ndarray]:
+        """Unit-normalized float32 embeddings, or None if the model is unavailable"""
+        try:
+            embeddings = self.embeddings_factory()
+            vectors = [embeddings.embed_query(texts[0])] if query else embeddings.embed_documents(texts)
+        except Exception as e:
+            print(f"⚠️ Document embedding unavailable, using keyword retrieval: {e}")
+            return None
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def create(self, text: str) -> str:
+        """Chunk and embed a document; the ID is derived from its content, so re-analysis reuses it"""
+        document_id = hashlib.sha256(normalize_document(text).encode("utf-8")).hexdigest()[:24]
+        with self._lock:
+            if document_id in self._sessions:
+                self._sessions.move_to_end(document_id)
+                self._sessions[document_id].last_used = time.monotonic()
+                return document_id
+
+        chunks = self._split(text) or [text]
+        session = DocumentSession(document_id, text, chunks, self._embed(chunks))
+
+        with self._lock:
+            self._sessions[document_id] = session
+            self._evict()
+        print(f"📑 Document session {document_id} ({len(chunks)} chunks)")
+        return document_id
+
+    def _evict(self):
+        now = time.monotonic()
+        expired = [doc_id for doc_id, s in self._sessions.items() if now - s.last_used > self.ttl_seconds]
+        for doc_id in expired:
+            del self._sessions[doc_id]
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def get(self, document_id: str) -> Optional[DocumentSession]:
+        with self._lock:
+            session = self._sessions.get(document_id)
+            if session is None:
+                return None
+            if time.monotonic() - session.last_used > self.ttl_seconds:
+                del self._sessions[document_id]
+                return None
+            session.last_used = time.monotonic()
+            self._sessions.move_to_end(document_id)
+            return session
+
+    def top_passages(self, session: DocumentSession, question: str, k: int = DOCUMENT_QA_TOP_K) -> List[str]:
+        """The k passages most relevant to the question, in document order"""
+        if len(session.chunks) <= k:
+            return list(session.chunks)
+
+        scores = None
+        if session.vectors is not None:
+            query = self._embed([question], query=True)
+            if query is not None:
+                scores = session.vectors @ query[0]
+        if scores is None:
+            # Keyword overlap fallback
+            terms = set(re.findall(r"\w+", question.lower()))
+            scores = np.array([len(terms & set(re.findall(r"\w+", chunk.lower()))) for chunk in session.chunks], dtype=np.float32)
+
+        best = np.argsort(-scores)[:k]
+        return [session.chunks[i] for i in sorted(best)]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "chunks": sum(len(s.chunks) for s in self._sessions.values())
+            }
+
+
+# Global instance
+document_session_store = DocumentSessionStore(get_embeddings)
@@ -0,0 +1,99 @@
+"""
+Embedding Cache
+Content-addressed cache of chunk embeddings: an in-memory LRU in front of a
+DiskCache, keyed by the hash of the model name and the exact chunk text
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from disk_cache import DiskCache
+
+
+class EmbeddingCache:
+    def __init__(self, model_name: str, max_entries: int, disk: DiskCache = None):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.disk = disk
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _key(self, text: str, kind: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{kind}\0{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: np.ndarray):
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _lookup(self, key: str):
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return vector
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                vector = np.frombuffer(value, dtype=np.float32)
+                self._remember(key, vector)
+                with self._lock:
+                    self.disk_hits += 1
+                return vector
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _store(self, key: str, vector: np.ndarray):
+        self._remember(key, vector)
+        if self.disk is not None:
+            self.disk.put(key, vector.tobytes())
+
+    def embed_documents(self, texts: List[str], embed_fn: Callable) -> np.ndarray:
+        """
+        Float32 embeddings for texts, one row each. Only texts not seen before
+        (under this model) are passed to embed_fn, in a single batch.
+        """
+        keys = [self._key(text, "doc") for text in texts]
+        vectors = [self._lookup(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = np.asarray(embed_fn([texts[i] for i in missing]), dtype=np.float32)
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+                self._store(keys[i], vector)
+        if not vectors:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(vectors)
+
+    def embed_query(self, text: str, embed_fn: Callable) -> np.ndarray:
+        """Float32 embedding of a search query"""
+        key = self._key(text, "query")
+        vector = self._lookup(key)
+        if vector is None:
+            vector = np.asarray(embed_fn(text), dtype=np.float32)
+            self._store(key, vector)
+        return vector
+
+    def stats(self) -> Dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "model": self.model_name,
+            "memory_entries": len(self._memory),
+            "max_memory_entries": self.max_entries,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "disk": self.disk.stats() if self.disk is not None else None
+        }
@@ -0,0 +1,83 @@
+"""
+Embedding Pipeline
+CPU sentence-embedding stage with explicit batch size, thread count and
+float32 output, used in place of LangChain's HuggingFaceEmbeddings
+
+Texts are sorted by length so each batch pads to similar lengths, encoded
+batch by batch, and written straight into one preallocated float32 matrix
+(row order matches the input) that can be handed to FAISS without a copy.
+"""
+
+import os
+import time
+import threading
+from typing import List
+
+import numpy as np
+
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0")) or (os.cpu_count() or 1)
+EMBEDDING_NORMALIZE = os.getenv("EMBEDDING_NORMALIZE", "false").lower() == "true"
+
+
+def model_identity(model_name: str, normalize: bool = EMBEDDING_NORMALIZE) -> str:
+    """Name under which vectors are cached and persisted; normalized vectors are not interchangeable"""
+    return f"{model_name}+normalized" if normalize else model_name
+
+
+class EmbeddingPipeline:
+    """
+    Same embed_documents / embed_query interface as HuggingFaceEmbeddings,
+    backed directly by sentence-transformers on the CPU.
+    """
+    def __init__(self, model_name: str, batch_size: int = EMBEDDING_BATCH_SIZE,
+                 threads: int = EMBEDDING_THREADS, normalize: bool = EMBEDDING_NORMALIZE):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.threads = threads
+        self.normalize = normalize
+        self.model = None
+        self.dimension = None
+        self._lock = threading.Lock()  # One encode at a time; each already uses every thread
+
+    def load(self):
+        """Load the model; thread settings must be in place before torch is imported"""
+        if self.model is not None:
+            return self
+        for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+            os.environ.setdefault(variable, str(self.threads))
+        started = time.perf_counter()
+        import torch
+        from sentence_transformers import SentenceTransformer
+        torch.set_num_threads(self.threads)
+        self.model = SentenceTransformer(self.model_name, device="cpu")
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        print(f"✅ Embedding model {self.model_name} loaded in {time.perf_counter() - started:.1f}s "
+              f"(dim {self.dimension}, batch {self.batch_size}, {self.threads} threads)")
+        return self
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), dimension) float32 matrix, rows in input order"""
+        self.load()
+        out = np.empty((len(texts), self.dimension), dtype=np.float32)
+        if not texts:
+            return out
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), self.batch_size):
+            rows = order[start:start + self.batch_size]
+            # Per batch, so a query waits for one batch of a large upload, not all of it
+            with self._lock:
+                out[rows] = self.model.encode(
+                    [texts[i] for i in rows],
+                    batch_size=self.batch_size,
+                    convert_to_numpy=True,
+                    normalize_embeddings=self.normalize,
+                    show_progress_bar=False
+                )
+        return out
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        return self.embed(texts)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return self.embed([text])[0]
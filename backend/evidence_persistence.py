@@ -0,0 +1,147 @@
+"""
+Evidence Persistence
+On-disk copy of the evidence index so a restarted worker can serve searches
+without re-ingesting or re-embedding anything
+
+Layout (format version 1):
+
+    manifest.json                 format version, embedding model, next chunk ID,
+                                  and one entry per file (including the blob hash
+                                  of its uploaded bytes, see blob_store.py; aliases
+                                  of re-uploaded files have an entry but no files/ dir)
+    files/<key>/seg-<id>-<model>.json  chunk IDs, texts and page numbers added in one build
+    files/<key>/seg-<id>-<model>.npy   float32 embeddings, one row per chunk (memory-mapped on load)
+    files/<key>/transcript.json   audio transcript
+    ivfpq.trained.faiss           trained, empty IVF-PQ index (large evidence sets only),
+                                  so a restart re-encodes the vectors without retraining
+
+`<key>` is derived from the filename, so deleting a file removes one directory.
+`<id>` is the segment's first chunk ID and `<model>` a hash of the embedding
+model, so re-embedded segments never overwrite the ones the manifest still
+lists (segments written before the hash was added are named seg-<id>).
+"""
+
+import os
+import json
+import shutil
+import hashlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+EVIDENCE_INDEX_DIR = os.getenv("EVIDENCE_INDEX_DIR", "evidence_index")
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class EvidenceIndexStore:
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(os.path.join(directory, "files"), exist_ok=True)
+
+    def file_dir(self, filename: str) -> str:
+        key = hashlib.sha256(filename.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, "files", key)
+
+    # ---------- Writes ----------
+
+    def write_segment(self, filename: str, chunks: List[Dict], vectors: np.ndarray, model: str) -> str:
+        """Persist one batch of a file's chunks with their embeddings; returns the segment name"""
+        segment = f"seg-{chunks[0]['id']}-{hashlib.sha256(model.encode('utf-8')).hexdigest()[:8]}"
+        directory = self.file_dir(filename)
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, f"{segment}.tmp.npy"), np.ascontiguousarray(vectors, dtype=np.float32))
+        os.replace(os.path.join(directory, f"{segment}.tmp.npy"), os.path.join(directory, f"{segment}.npy"))
+        _write_atomic(
+            os.path.join(directory, f"{segment}.json"),
+            json.dumps([{key: c[key] for key in ("id", "content", "page") if key in c} for c in chunks], ensure_ascii=False).encode("utf-8")
+        )
+        return segment
+
+    def write_transcript(self, filename: str, transcript: Dict):
+        directory = self.file_dir(filename)
+        os.makedirs(directory, exist_ok=True)
+        _write_atomic(os.path.join(directory, "transcript.json"), json.dumps(transcript, ensure_ascii=False).encode("utf-8"))
+
+    def rename_file(self, filename: str, new_filename: str):
+        if os.path.exists(self.file_dir(filename)):
+            shutil.rmtree(self.file_dir(new_filename), ignore_errors=True)
+            os.replace(self.file_dir(filename), self.file_dir(new_filename))
+
+    def delete_segment(self, filename: str, segment: str):
+        for suffix in (".json", ".npy"):
+            path = os.path.join(self.file_dir(filename), f"{segment}{suffix}")
+            if os.path.exists(path):
+                os.remove(path)
+
+    def delete_file(self, filename: str):
+        shutil.rmtree(self.file_dir(filename), ignore_errors=True)
+
+    def write_manifest(self, manifest: Dict):
+        manifest = dict(manifest, format_version=FORMAT_VERSION)
+        _write_atomic(os.path.join(self.directory, "manifest.json"), json.dumps(manifest, ensure_ascii=False).encode("utf-8"))
+
+    def write_trained_index(self, data: bytes):
+        _write_atomic(os.path.join(self.directory, "ivfpq.trained.faiss"), data)
+
+    def clear(self):
+        shutil.rmtree(os.path.join(self.directory, "files"), ignore_errors=True)
+        os.makedirs(os.path.join(self.directory, "files"), exist_ok=True)
+        for name in ("manifest.json", "ivfpq.trained.faiss"):
+            path = os.path.join(self.directory, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    # ---------- Reads ----------
+
+    def read_manifest(self) -> Optional[Dict]:
+        """The saved manifest, or None if there is none or it has another format version"""
+        path = os.path.join(self.directory, "manifest.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != FORMAT_VERSION:
+            print(f"⚠️ Ignoring evidence index at {self.directory}: format version "
+                  f"{manifest.get('format_version')} != {FORMAT_VERSION}")
+            return None
+        return manifest
+
+    def read_segment(self, filename: str, segment: str):
+        """(chunks, vectors) of a segment; vectors are memory-mapped, not read into RAM"""
+        directory = self.file_dir(filename)
+        with open(os.path.join(directory, f"{segment}.json"), "r", encoding="utf-8") as f:
+            chunks = json.load(f)
+        return chunks, self.map_segment_vectors(filename, segment)
+
+    def map_segment_vectors(self, filename: str, segment: str) -> np.ndarray:
+        return np.load(os.path.join(self.file_dir(filename), f"{segment}.npy"), mmap_mode="r")
+
+    def read_original(self, filename: str) -> Optional[bytes]:
+        """Uploaded bytes saved by indexes written before the blob store"""
+        path = os.path.join(self.file_dir(filename), "original.bin")
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def read_trained_index(self) -> Optional[bytes]:
+        path = os.path.join(self.directory, "ivfpq.trained.faiss")
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def read_transcript(self, filename: str) -> Optional[Dict]:
+        path = os.path.join(self.file_dir(filename), "transcript.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
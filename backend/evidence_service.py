@@ -1,92 +1,282 @@
 import os
-from PyPDF2 import PdfReader
-from PIL import Image
-import pytesseract
-from io import BytesIO
+import time
+import threading
+import numpy as np
+from text_extraction import extract_pdf_text, extract_image_text, extract_pages, DOCUMENT_EXTENSIONS
+from vector_index import VectorIndex
+from lexical_index import LexicalIndex, is_lexical_query, reciprocal_rank_fusion
+from evidence_persistence import EvidenceIndexStore, EVIDENCE_INDEX_DIR
+from embedding_cache import EmbeddingCache
+from disk_cache import DiskCache, CACHE_DIR
+from blob_store import evidence_blob_store
+from embedding_pipeline import EmbeddingPipeline, model_identity
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+EMBEDDING_MODEL_ID = model_identity(EMBEDDING_MODEL_NAME)  # Model plus output settings
+EMBEDDING_CACHE_ENTRIES = int(os.getenv("EMBEDDING_CACHE_ENTRIES", "20000"))
+EMBEDDING_CACHE_MAX_MB = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "500"))
+# hybrid (BM25 + vectors, fused by reciprocal rank), vector or lexical
+EVIDENCE_SEARCH_MODE = os.getenv("EVIDENCE_SEARCH_MODE", "hybrid")
+EVIDENCE_RRF_K = int(os.getenv("EVIDENCE_RRF_K", "60"))
+
+SYNOPSIS_CHARS = 500
+# Per-file facts kept in file_storage and the saved manifest, so listings never scan chunks
+FILE_INFO_FIELDS = ("pages", "chunks", "synopsis", "ingest_seconds")
+
+_embeddings = None
+_embeddings_lock = threading.Lock()
+_text_splitter = None
+_text_splitter_lock = threading.Lock()
+
+
+def get_embeddings():
+    """Shared sentence-embedding model, loaded once on first use"""
+    global _embeddings
+    with _embeddings_lock:
+        if _embeddings is None:
+            print("🔄 Loading embeddings model...")
+            _embeddings = EmbeddingPipeline(EMBEDDING_MODEL_NAME).load()
+    return _embeddings
+
+
+def get_text_splitter():
+    """Shared evidence text splitter, created once on first use"""
+    global _text_splitter
+    with _text_splitter_lock:
+        if _text_splitter is None:
+            from langchain_text_splitters import RecursiveCharacterTextSplitter
+            _text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=1000,
+                chunk_overlap=200
+            )
+    return _text_splitter
+
+
+def make_synopsis(text):
+    text = " ".join(text.split())
+    return text[:SYNOPSIS_CHARS] + "..." if len(text) > SYNOPSIS_CHARS else text
+
+
+# Shared by every EvidenceManager: the same exhibit text is embedded once per model
+embedding_cache = EmbeddingCache(
+    EMBEDDING_MODEL_ID,
+    EMBEDDING_CACHE_ENTRIES,
+    DiskCache(os.path.join(CACHE_DIR, "embeddings"), EMBEDDING_CACHE_MAX_MB * 1024 * 1024)
+)
+
 
 class EvidenceManager:
-    def __init__(self):
+    def __init__(self, index_dir=EVIDENCE_INDEX_DIR, embedding_cache=embedding_cache, blob_store=evidence_blob_store):
         self.embeddings = None  # Lazy load to speed up startup
-        self.vector_store = None
-        self.documents = []
+        self.vector_store = VectorIndex(vector_lookup=self._saved_vectors)  # Chunk vectors by chunk ID
+        self.vector_rows = {}  # Chunk ID -> (memory-mapped segment, row): exact vectors on disk
+        self.lexical_index = LexicalIndex()  # BM25 postings by chunk ID (searchable before embedding)
+        self.chunks_by_id = {}  # Chunk ID -> document entry, in upload order
+        self.file_chunks = {}  # Filename -> chunk IDs of that file
+        self.pending_documents = {}  # Chunks not yet embedded into the index
+        self.next_chunk_id = 0
         self.audio_transcripts = {}  # Store audio transcripts separately
         self.text_splitter = None  # Lazy load
-        self.file_storage = {}  # Store original file bytes for download
+        self.file_storage = {}  # Filename -> blob hash, size, type, pages, chunk count, synopsis (bytes stay on disk)
+        self.aliases = {}  # Filename -> filename whose chunks it shares (same bytes uploaded again)
+        self.blob_store = blob_store
+        self.generation = 0  # Bumped whenever the searchable index changes
+        self._build_lock = threading.Lock()  # Builds run off the event loop, one at a time
+        self.index_store = EvidenceIndexStore(index_dir) if index_dir else None  # None = memory only
+        self.manifest = {}  # Filename -> what is saved for it in the index store
+        self.trained_index_saved = False  # IVF-PQ training written to the index store
+        # Filename -> segments saved with an older embedding model, kept until their re-embedded
+        # replacements are written (while any remain, the manifest keeps naming the older model)
+        self.stale_segments = {}
+        self.stale_model = None
+        self.embedding_cache = embedding_cache  # None = always call the model
+    
+    @property
+    def documents(self):
+        """All chunk entries in upload order"""
+        return list(self.chunks_by_id.values())
     
     def _ensure_embeddings(self):
         """Lazy load embeddings model only when needed"""
         if self.embeddings is None:
-            print("🔄 Loading embeddings model...")
-            try:
-                from langchain_huggingface import HuggingFaceEmbeddings
-            except ImportError:
-                from langchain_community.embeddings import HuggingFaceEmbeddings
-            self.embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-            print("✅ Embeddings model loaded")
+            self.embeddings = get_embeddings()
+    
+    def _embed_documents(self, texts):
+        """Chunk embeddings, from the embedding cache where possible"""
+        def embed(missing):
+            self._ensure_embeddings()  # Load embeddings only when needed
+            return self.embeddings.embed_documents(missing)
+        if self.embedding_cache is None:
+            return embed(texts)
+        return self.embedding_cache.embed_documents(texts, embed)
+    
+    def _embed_query(self, query):
+        def embed(text):
+            self._ensure_embeddings()
+            return self.embeddings.embed_query(text)
+        if self.embedding_cache is None:
+            return embed(query)
+        return self.embedding_cache.embed_query(query, embed)
     
     def _ensure_text_splitter(self):
         """Lazy load text splitter"""
         if self.text_splitter is None:
-            from langchain_text_splitters import RecursiveCharacterTextSplitter
-            self.text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,
-                chunk_overlap=200
-            )
+            self.text_splitter = get_text_splitter()
     
     def extract_text_from_pdf(self, file_bytes):
         """Extract text from PDF file"""
-        try:
-            pdf = PdfReader(BytesIO(file_bytes))
-            text = ""
-            for page in pdf.pages:
-                text += page.extract_text() + "\n"
-            return text
-        except Exception as e:
-            raise Exception(f"Error extracting PDF text: {e}")
+        return extract_pdf_text(file_bytes)
     
     def extract_text_from_image(self, file_bytes):
         """Extract text from image using OCR"""
-        try:
-            image = Image.open(BytesIO(file_bytes))
-            text = pytesseract.image_to_string(image)
-            return text
-        except Exception as e:
-            raise Exception(f"Error extracting image text: {e}")
+        return extract_image_text(file_bytes)
+    
+    def split_text(self, text):
+        """Split extracted text into chunks"""
+        self._ensure_text_splitter()
+        return self.text_splitter.split_text(text)
+    
+    def split_pages(self, pages):
+        """Split extracted pages into (chunk, page number) pairs, never crossing a page break"""
+        self._ensure_text_splitter()
+        return [
+            (chunk, page["page"])
+            for page in pages
+            for chunk in self.text_splitter.split_text(page["text"])
+        ]
     
     def process_file(self, file_bytes, filename, file_type="document"):
         """Process uploaded file (PDF, Image, or Audio)"""
         file_ext = filename.lower().split('.')[-1]
         
-        # Store original file for download
-        self.file_storage[filename] = {
-            "content": file_bytes,
-            "type": file_type,
-            "extension": file_ext
-        }
-        
+        blob = self.blob_store.put_bytes(file_bytes)
         if file_type == "audio":
             # Audio files are processed separately with transcription
             # Just return 0 chunks as they're handled differently
+            self.add_document(filename, [], blob, file_type)
             return 0
-        elif file_ext == 'pdf':
-            text = self.extract_text_from_pdf(file_bytes)
-        elif file_ext in ['jpg', 'jpeg', 'png', 'bmp', 'tiff']:
-            text = self.extract_text_from_image(file_bytes)
-        else:
+        elif file_ext not in DOCUMENT_EXTENSIONS:
             raise ValueError(f"Unsupported file type: {file_ext}")
         
-        # Split text into chunks
-        self._ensure_text_splitter()
-        chunks = self.text_splitter.split_text(text)
+        pages = extract_pages(file_bytes, file_ext)
+        return self.add_document(filename, self.split_pages(pages), blob, file_type)
+    
+    def _store_file(self, filename, blob, file_type):
+        """Remember where an uploaded file's bytes are stored, for download"""
+        previous = self.file_storage.get(filename)
+        self.file_storage[filename] = {
+            "blob": blob["sha256"],
+            "size": blob["size"],
+            "type": file_type,
+            "extension": filename.lower().split('.')[-1]
+        }
+        if previous and previous["blob"] != blob["sha256"]:
+            self._release_blob(previous["blob"])
+    
+    def _describe_file(self, filename, pages=None):
+        """Record a file's page count, chunk count and synopsis once its chunks are added"""
+        entry = self.file_storage.get(filename)
+        if entry is None:
+            return
+        docs = [self.chunks_by_id[i] for i in self.file_chunks.get(filename, []) if i in self.chunks_by_id]
+        if pages is None:
+            pages = max((doc["page"] for doc in docs if doc.get("page")), default=None)
+        transcript = self.audio_transcripts.get(filename)
+        text = transcript["text"] if transcript else " ".join(doc["content"] for doc in docs[:2])
+        entry.update(pages=pages, chunks=len(docs), synopsis=make_synopsis(text))
+    
+    def _file_info(self, filename):
+        entry = self.file_storage.get(filename, {})
+        return {key: entry[key] for key in FILE_INFO_FIELDS if key in entry}
+    
+    def _release_blob(self, sha256):
+        """Delete a blob once no filename refers to it (nor a queued upload: see BlobStore.hold)"""
+        if sha256 and not any(entry["blob"] == sha256 for entry in self.file_storage.values()):
+            self.blob_store.delete(sha256)
+    
+    def release_upload(self, sha256):
+        """End an upload's hold on its blob, deleting it if ingestion failed and nothing else uses it"""
+        self.blob_store.unhold(sha256)
+        self._release_blob(sha256)
+    
+    def find_duplicate(self, sha256):
+        """Already-indexed file with exactly these bytes (never an alias), or None"""
+        for filename, entry in self.file_storage.items():
+            if entry["blob"] == sha256 and filename not in self.aliases and (
+                    filename in self.file_chunks or filename in self.audio_transcripts):
+                return filename
+        return None
+    
+    def add_alias(self, filename, canonical, blob):
+        """Register a re-upload of a known file under a new name, reusing its chunks and transcript"""
+        self._store_file(filename, blob, self.file_storage[canonical]["type"])
+        self.file_storage[filename].update(
+            {key: value for key, value in self._file_info(canonical).items() if key != "ingest_seconds"}
+        )
+        self.aliases[filename] = canonical
+        self.generation += 1
+        if self.index_store:
+            self.manifest[filename] = {
+                "type": self.file_storage[filename]["type"],
+                "extension": self.file_storage[filename]["extension"],
+                "segments": [],
+                "transcript": False,
+                "alias_of": canonical,
+                "blob": blob["sha256"],
+                "size": blob["size"],
+                **self._file_info(filename)
+            }
+            self._save_manifest()
+    
+    def set_ingest_seconds(self, filename, seconds):
+        """Remember how long a file took to ingest (reported as saved when it is re-uploaded)"""
+        if filename in self.file_storage:
+            self.file_storage[filename]["ingest_seconds"] = round(seconds, 2)
+        if self.index_store and filename in self.manifest:
+            self.manifest[filename]["ingest_seconds"] = round(seconds, 2)
+            self._save_manifest()
+    
+    def get_file_path(self, filename):
+        """Path of an uploaded file's bytes on disk, or None"""
+        entry = self.file_storage.get(filename)
+        return self.blob_store.path(entry["blob"]) if entry and entry["blob"] else None
+    
+    def list_files(self):
+        """One entry per uploaded file, from the per-file manifest"""
+        return [
+            {
+                "filename": filename,
+                "type": entry["type"],
+                "size": entry.get("size"),
+                "sha256": entry["blob"],
+                "pages": entry.get("pages"),
+                "chunks": entry.get("chunks", 0),
+                "synopsis": entry.get("synopsis", ""),
+                "has_transcript": self.aliases.get(filename, filename) in self.audio_transcripts,
+                **({"alias_of": self.aliases[filename]} if filename in self.aliases else {})
+            }
+            for filename, entry in self.file_storage.items()
+        ]
+    
+    def add_document(self, filename, chunks, blob, file_type="document", pages=None):
+        """
+        Store an uploaded file (already written to the blob store) and its
+        split text chunks, given as strings or (chunk, page number) pairs
+        """
+        # Store original file for download
+        self._store_file(filename, blob, file_type)
         
         # Store metadata
-        docs = [{"content": chunk, "filename": filename} for chunk in chunks]
-        self.documents.extend(docs)
+        self._add_chunks(chunks, filename)
+        self._describe_file(filename, pages)
         
         return len(chunks)
     
-    def add_audio_transcript(self, filename, transcript_text, transcript_data=None):
+    def add_audio_transcript(self, filename, transcript_text, transcript_data=None, blob=None):
         """Add audio transcript to evidence"""
+        if blob:
+            self._store_file(filename, blob, "audio")
+        
         # Store full transcript data
         self.audio_transcripts[filename] = {
             "text": transcript_text,
@@ -94,48 +284,320 @@ class EvidenceManager:
         }
         
         # Split and add to documents for RAG
-        self._ensure_text_splitter()
-        chunks = self.text_splitter.split_text(transcript_text)
-        docs = [{"content": chunk, "filename": filename} for chunk in chunks]
-        self.documents.extend(docs)
+        chunks = self.split_text(transcript_text)
+        self._add_chunks(chunks, filename)
+        self._describe_file(filename)
         
         return len(chunks)
     
+    def _add_chunks(self, chunks, filename):
+        """Register chunks under new, stable chunk IDs and queue them for embedding"""
+        chunk_ids = self.file_chunks.setdefault(filename, [])
+        for chunk in chunks:
+            doc = {"id": self.next_chunk_id, "content": chunk, "filename": filename}
+            if isinstance(chunk, tuple):
+                doc["content"], doc["page"] = chunk
+            self.next_chunk_id += 1
+            self.chunks_by_id[doc["id"]] = doc
+            self.pending_documents[doc["id"]] = doc
+            self.lexical_index.add(doc["id"], doc["content"])
+            chunk_ids.append(doc["id"])
+    
     def build_vector_store(self):
-        """Build FAISS vector store from all documents"""
-        if not self.documents:
+        """Embed chunks added since the last build and add them to the index"""
+        if not self.chunks_by_id:
             return False
+        with self._build_lock:
+            pending = list(self.pending_documents.values())
+            if not pending:
+                return True
+            
+            vectors = self._embed_documents([doc["content"] for doc in pending])
+            self.vector_store.add([doc["id"] for doc in pending], vectors)
+            for doc in pending:
+                self.pending_documents.pop(doc["id"], None)
+            
+            # Files deleted while their chunks were being embedded
+            deleted = [doc["id"] for doc in pending if doc["id"] not in self.chunks_by_id]
+            if deleted:
+                self.vector_store.remove(deleted)
+                keep = [i for i, doc in enumerate(pending) if doc["id"] in self.chunks_by_id]
+                pending, vectors = [pending[i] for i in keep], np.asarray(vectors)[keep]
+            
+            self.generation += 1
+            self._save_segments(pending, vectors)
+            self._save_trained_index()
         
-        self._ensure_embeddings()  # Load embeddings only when needed
+        print(f"🗂️ Indexed {len(pending)} new chunks ({len(self.vector_store)} total)")
+        return True
+    
+    def rebuild_vector_store(self):
+        """Re-embed every remaining document into a fresh index"""
+        self.vector_store.reset()
+        self.vector_rows = {}
+        self.trained_index_saved = False
+        if self.index_store:
+            self.index_store.clear()
+            self.stale_segments = {}
+            self.manifest = {}
+        self.pending_documents = dict(self.chunks_by_id)
+        if not self.build_vector_store():
+            self.generation += 1
+    
+    def remove_file(self, filename):
+        """
+        Drop a file's chunks, vectors, transcript and stored bytes. Only the
+        file's own chunk IDs are touched; nothing is re-embedded.
+        Returns the number of chunks removed. Removing an alias keeps the
+        shared chunks; removing a file with aliases hands its chunks to one.
+        Blocking (waits for a running build): call it off the event loop.
+        """
+        with self._build_lock:  # Serialized with builds, which add and save the same chunks
+            if filename in self.aliases:
+                return self._remove_alias(filename)
+            aliases = [alias for alias, canonical in self.aliases.items() if canonical == filename]
+            if aliases:
+                self._promote_alias(filename, aliases)
+                return 0
+            chunk_ids = self.file_chunks.pop(filename, [])
+            for chunk_id in chunk_ids:
+                self.chunks_by_id.pop(chunk_id, None)
+                self.pending_documents.pop(chunk_id, None)
+                self.vector_rows.pop(chunk_id, None)
+            self.vector_store.remove(chunk_ids)
+            self.lexical_index.remove(chunk_ids)
+            self.audio_transcripts.pop(filename, None)
+            stored = self.file_storage.pop(filename, None)
+            if stored:
+                self._release_blob(stored["blob"])
+            self.generation += 1
+            self.stale_segments.pop(filename, None)
+            if self.index_store and self.manifest.pop(filename, None) is not None:
+                self.index_store.delete_file(filename)
+                self._save_manifest()
+            return len(chunk_ids)
+    
+    def _remove_alias(self, filename):
+        self.aliases.pop(filename)
+        stored = self.file_storage.pop(filename, None)
+        if stored:
+            self._release_blob(stored["blob"])
+        self.generation += 1
+        if self.index_store and self.manifest.pop(filename, None) is not None:
+            self._save_manifest()
+        return 0
+    
+    def _promote_alias(self, filename, aliases):
+        """Move a file's chunks, transcript and saved index to its first alias, which replaces it"""
+        successor = aliases[0]
+        del self.aliases[successor]
+        for alias in aliases[1:]:
+            self.aliases[alias] = successor
+        self.file_chunks[successor] = self.file_chunks.pop(filename, [])
+        for chunk_id in self.file_chunks[successor]:
+            self.chunks_by_id[chunk_id]["filename"] = successor
+        if filename in self.audio_transcripts:
+            self.audio_transcripts[successor] = self.audio_transcripts.pop(filename)
+        if filename in self.stale_segments:
+            self.stale_segments[successor] = self.stale_segments.pop(filename)
+        stored = self.file_storage.pop(filename, {})
+        successor_file = self.file_storage[successor]
+        successor_file.update({key: stored[key] for key in FILE_INFO_FIELDS if key in stored})
+        self.generation += 1
+        if self.index_store and filename in self.manifest:
+            entry = self.manifest.pop(filename)
+            self.index_store.rename_file(filename, successor)
+            for alias in aliases[1:]:
+                self.manifest[alias]["alias_of"] = successor
+            self.manifest[successor] = dict(entry, blob=successor_file["blob"], size=successor_file["size"])
+            self._save_manifest()
+        print(f"🔁 {filename} removed; its evidence now belongs to {successor}")
+    
+    def _saved_vectors(self, chunk_ids):
+        """Exact embeddings of chunks from their saved segments, or None if any is not on disk"""
+        try:
+            return np.stack([segment[row] for segment, row in (self.vector_rows[i] for i in chunk_ids)])
+        except KeyError:
+            return None
+    
+    # ---------- Persistence ----------
+    
+    def _save_manifest(self):
+        self.index_store.write_manifest({
+            "embedding_model": self.stale_model if self.stale_segments else EMBEDDING_MODEL_ID,
+            "next_chunk_id": self.next_chunk_id,
+            "trained_index": self.trained_index_saved,
+            "files": self.manifest
+        })
+    
+    def _save_trained_index(self):
+        """Keep the IVF-PQ training once the index has switched to it"""
+        if self.index_store is None or self.trained_index_saved or self.vector_store.kind != "ivfpq":
+            return
+        self.index_store.write_trained_index(self.vector_store.trained_state())
+        self.trained_index_saved = True
+        self._save_manifest()
+    
+    def _save_segments(self, docs, vectors):
+        """Write newly indexed chunks and their embeddings to the index store, one segment per file"""
+        if self.index_store is None:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        rows_by_file = {}
+        for row, doc in enumerate(docs):
+            rows_by_file.setdefault(doc["filename"], []).append(row)
+        
+        replaced = {}  # Filename -> its stale segments, superseded by this build
+        for filename, rows in rows_by_file.items():
+            entry = self.manifest.setdefault(filename, {
+                "type": "audio" if filename in self.audio_transcripts else "document",
+                "extension": filename.lower().split('.')[-1],
+                "segments": [],
+                "transcript": False
+            })
+            if filename in self.stale_segments and filename not in replaced:
+                replaced[filename] = self.stale_segments.pop(filename)
+                entry["segments"] = []
+            segment = self.index_store.write_segment(filename, [docs[row] for row in rows], vectors[rows], EMBEDDING_MODEL_ID)
+            entry["segments"].append(segment)
+            mapped = self.index_store.map_segment_vectors(filename, segment)
+            for i, row in enumerate(rows):
+                self.vector_rows[docs[row]["id"]] = (mapped, i)
+            if filename in self.file_storage:
+                entry["blob"] = self.file_storage[filename]["blob"]
+                entry["size"] = self.file_storage[filename]["size"]
+                entry.update(self._file_info(filename))
+            if not entry["transcript"] and filename in self.audio_transcripts:
+                self.index_store.write_transcript(filename, self.audio_transcripts[filename])
+                entry["transcript"] = True
+        self._save_manifest()
+        for filename, segments in replaced.items():
+            for segment in set(segments) - set(self.manifest[filename]["segments"]):
+                self.index_store.delete_segment(filename, segment)
+    
+    def load_index(self):
+        """
+        Restore chunks, embeddings, transcripts and files saved by a previous
+        run. Embeddings are memory-mapped and added to the index as they are,
+        so nothing is re-embedded unless the embedding model changed (then a
+        background build re-embeds them, replacing the old segments). Returns the number of chunks loaded.
+        """
+        if self.index_store is None:
+            return 0
+        started = time.perf_counter()
+        saved = self.index_store.read_manifest()
+        if not saved:
+            return 0
         
-        texts = [doc["content"] for doc in self.documents]
-        metadatas = [{"filename": doc["filename"]} for doc in self.documents]
+        reembed = saved.get("embedding_model") != EMBEDDING_MODEL_ID
+        self.stale_model = saved.get("embedding_model")
+        migrated = False
+        if reembed:
+            print(f"⚠️ Evidence index was built with {saved.get('embedding_model')}; chunks will be re-embedded")
+        elif saved.get("trained_index") and self.vector_store.index_type in ("auto", "ivfpq"):
+            trained = self.index_store.read_trained_index()
+            if trained:
+                self.vector_store.load_trained(trained)
+                self.trained_index_saved = True
         
-        from langchain_community.vectorstores import FAISS
-        self.vector_store = FAISS.from_texts(
-            texts=texts,
-            embedding=self.embeddings,
-            metadatas=metadatas
-        )
+        for filename, entry in saved["files"].items():
+            for segment in entry["segments"]:
+                chunks, vectors = self.index_store.read_segment(filename, segment)
+                docs = [dict(chunk, filename=filename) for chunk in chunks]
+                for doc in docs:
+                    self.chunks_by_id[doc["id"]] = doc
+                    self.lexical_index.add(doc["id"], doc["content"])
+                    self.file_chunks.setdefault(filename, []).append(doc["id"])
+                    if reembed:
+                        self.pending_documents[doc["id"]] = doc
+                if not reembed:
+                    self.vector_store.add([doc["id"] for doc in docs], vectors)
+                    for row, doc in enumerate(docs):
+                        self.vector_rows[doc["id"]] = (vectors, row)
+            if reembed and entry["segments"]:
+                self.stale_segments[filename] = list(entry["segments"])
+            if entry.get("transcript"):
+                self.audio_transcripts[filename] = self.index_store.read_transcript(filename)
+            if entry.pop("original", False):
+                # Indexes saved before the blob store kept a copy of the file alongside
+                blob = self.blob_store.put_bytes(self.index_store.read_original(filename))
+                entry["blob"], entry["size"] = blob["sha256"], blob["size"]
+                migrated = True
+            self.file_storage[filename] = {
+                "blob": entry["blob"] if entry.get("blob") and self.blob_store.exists(entry["blob"]) else None,
+                "size": entry.get("size", 0),
+                "type": entry["type"],
+                "extension": entry["extension"],
+                **{key: entry[key] for key in FILE_INFO_FIELDS if key in entry}
+            }
+            if entry.get("alias_of"):
+                self.aliases[filename] = entry["alias_of"]
         
-        return True
+        self.manifest = saved["files"]
+        # Indexes saved before the per-file manifest: describe each file once
+        for filename, entry in self.manifest.items():
+            if "chunks" not in entry and not entry.get("alias_of"):
+                self._describe_file(filename)
+                entry.update(self._file_info(filename))
+                migrated = True
+        for alias, canonical in self.aliases.items():
+            if "chunks" not in self.file_storage[alias] and canonical in self.file_storage:
+                self.file_storage[alias].update(self._file_info(canonical))
+        self.next_chunk_id = max(self.next_chunk_id, saved.get("next_chunk_id", 0))
+        self.generation += 1
+        if reembed or migrated:
+            self._save_manifest()
+        
+        print(f"📂 Loaded evidence index: {len(self.manifest)} files, {len(self.chunks_by_id)} chunks "
+              f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+        if self.stale_segments:
+            # Searchable by keyword meanwhile; the old segments stay on disk until this succeeds
+            threading.Thread(target=self._reembed_stale, name="evidence-reembed", daemon=True).start()
+        return len(self.chunks_by_id)
+    
+    def _reembed_stale(self):
+        try:
+            self.build_vector_store()
+        except Exception as e:
+            print(f"❌ Re-embedding evidence failed (will retry on the next build or restart): {e}")
     
-    def search_evidence(self, query, k=3):
-        """Search for relevant evidence chunks"""
+    def _vector_search(self, query, k):
         if not self.vector_store:
             return []
+        return self.vector_store.search(self._embed_query(query), k)
+    
+    def search_evidence(self, query, k=3, mode=None):
+        """
+        Search for relevant evidence chunks. In hybrid mode the BM25 and vector
+        rankings are fused by reciprocal rank; identifier lookups ("Section 420")
+        that BM25 answers are served without embedding the query.
+        "score" is the fused score, BM25 score or L2 distance ("match" says which).
+        """
+        mode = mode or EVIDENCE_SEARCH_MODE
+        candidates = max(k * 4, 20)  # Depth of each ranking fed to the fusion
         
-        self._ensure_embeddings()  # Ensure embeddings loaded
-        
-        results = self.vector_store.similarity_search_with_score(query, k=k)
+        if mode == "vector":
+            match, results = "vector", self._vector_search(query, k)
+        elif mode == "lexical":
+            match, results = "lexical", self.lexical_index.search(query, k)
+        else:
+            lexical = self.lexical_index.search(query, candidates)
+            if lexical and is_lexical_query(query):
+                match, results = "lexical", lexical[:k]
+            else:
+                vector = self._vector_search(query, candidates)
+                match, results = "hybrid", reciprocal_rank_fusion([lexical, vector], k, EVIDENCE_RRF_K)
         
         return [
             {
-                "content": doc.page_content,
-                "filename": doc.metadata.get("filename", "Unknown"),
-                "score": float(score)
+                "content": self.chunks_by_id[chunk_id]["content"],
+                "filename": self.chunks_by_id[chunk_id]["filename"],
+                "page": self.chunks_by_id[chunk_id].get("page"),
+                "score": score,
+                "match": match
             }
-            for doc, score in results
+            for chunk_id, score in results
+            if chunk_id in self.chunks_by_id
         ]
     
     def get_all_evidence_text(self):
@@ -143,33 +605,44 @@ class EvidenceManager:
         return "\n\n".join([f"[{doc['filename']}]\n{doc['content']}" for doc in self.documents])
     
     def get_evidence_list(self):
-        """Get list of all evidence documents with metadata for report"""
-        evidence_list = []
-        
-        # Add document evidence
-        for doc in self.documents:
-            evidence_list.append({
-                "name": doc.get('filename', 'Unknown'),
-                "type": doc.get('type', 'document'),
-                "analysis": doc.get('content', '')[:500] + "..." if len(doc.get('content', '')) > 500 else doc.get('content', '')
-            })
+        """Get list of all evidence documents with metadata for report, one exhibit per file"""
+        aliases = {}
+        for alias, canonical in self.aliases.items():
+            aliases.setdefault(canonical, []).append(alias)
         
-        # Add audio transcripts
-        for filename, transcript_data in self.audio_transcripts.items():
-            evidence_list.append({
+        return [
+            {
                 "name": filename,
-                "type": "audio",
-                "analysis": transcript_data.get('transcript', '')[:500] + "..." if len(transcript_data.get('transcript', '')) > 500 else transcript_data.get('transcript', '')
-            })
-        
-        return evidence_list
+                "type": entry["type"],
+                "analysis": entry.get("synopsis", ""),
+                "pages": entry.get("pages"),
+                "chunks": entry.get("chunks", 0),
+                "aliases": aliases.get(filename, [])
+            }
+            for filename, entry in self.file_storage.items()
+            if filename not in self.aliases
+        ]
     
     def clear_evidence(self):
-        """Clear all evidence"""
-        self.documents = []
-        self.audio_transcripts = {}
-        self.vector_store = None
+        """Clear all evidence (blocking: waits for a running build)"""
+        with self._build_lock:
+            self.chunks_by_id = {}
+            self.file_chunks = {}
+            self.pending_documents = {}
+            self.audio_transcripts = {}
+            self.file_storage = {}
+            self.aliases = {}
+            self.blob_store.clear()
+            self.vector_store.reset()
+            self.lexical_index.reset()
+            self.vector_rows = {}
+            self.trained_index_saved = False
+            self.generation += 1
+            if self.index_store:
+                self.index_store.clear()
+                self.stale_segments = {}
+                self.manifest = {}
     
     def get_audio_transcript(self, filename):
         """Get transcript for a specific audio file"""
-        return self.audio_transcripts.get(filename)
+        return self.audio_transcripts.get(self.aliases.get(filename, filename))
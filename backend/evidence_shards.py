@@ -0,0 +1,174 @@
+"""
+Evidence Shards
+One evidence index per meeting: each meeting's exhibits live in their own
+EvidenceManager (index, chunks, files), loaded from disk on first use and
+dropped from memory when idle, so a search only ever scans its own case
+"""
+
+import os
+import re
+import time
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from evidence_service import EvidenceManager
+from evidence_persistence import EVIDENCE_INDEX_DIR
+from blob_store import BlobStore, evidence_blob_store, EVIDENCE_BLOB_DIR
+
+EVIDENCE_SHARD_IDLE_SECONDS = float(os.getenv("EVIDENCE_SHARD_IDLE_SECONDS", "1800"))
+EVIDENCE_SHARDS_MAX_LOADED = int(os.getenv("EVIDENCE_SHARDS_MAX_LOADED", "32"))
+
+# Evidence uploaded without a meeting ID (and the pre-sharding index)
+GLOBAL_SHARD = "global"
+
+
+class InvalidMeetingId(ValueError):
+    pass
+
+
+class EvidenceShards:
+    def __init__(self, index_dir: Optional[str] = EVIDENCE_INDEX_DIR, blob_dir: str = EVIDENCE_BLOB_DIR,
+                 idle_seconds: float = EVIDENCE_SHARD_IDLE_SECONDS, max_loaded: int = EVIDENCE_SHARDS_MAX_LOADED):
+        self.index_dir = index_dir
+        self.blob_dir = blob_dir
+        self.idle_seconds = idle_seconds
+        self.max_loaded = max_loaded
+        self._shards: Dict[str, EvidenceManager] = {}
+        self._last_used: Dict[str, float] = {}
+        self._epochs: Dict[str, int] = {}  # Load number of each loaded shard
+        self._lock = threading.Lock()  # Bookkeeping only, never held while a shard loads
+        self._load_locks: Dict[str, threading.Lock] = {}  # Scope -> lock held while it loads
+        self._ingesting: Dict[str, int] = {}  # Scope -> ingestion jobs running on it
+        self.loads = 0
+        self.evictions = 0
+
+    @staticmethod
+    def scope_for(meeting_id: Optional[str]) -> str:
+        """Shard name for a meeting ID (the global shard when there is none)"""
+        if not meeting_id or not meeting_id.strip():
+            return GLOBAL_SHARD
+        scope = meeting_id.strip().upper()
+        if not re.fullmatch(r"[A-Z0-9_-]{1,64}", scope):
+            raise InvalidMeetingId(f"Invalid meeting ID: {meeting_id}")
+        return scope
+
+    def _create(self, scope: str) -> EvidenceManager:
+        if scope == GLOBAL_SHARD:
+            blob_store = evidence_blob_store if self.blob_dir == EVIDENCE_BLOB_DIR else BlobStore(self.blob_dir)
+            manager = EvidenceManager(self.index_dir, blob_store=blob_store)
+        else:
+            index_dir = os.path.join(self.index_dir, "meetings", scope) if self.index_dir else None
+            blob_store = BlobStore(os.path.join(self.blob_dir, "meetings", scope))
+            manager = EvidenceManager(index_dir, blob_store=blob_store)
+        manager.load_index()
+        return manager
+
+    def is_loaded(self, meeting_id: Optional[str]) -> bool:
+        return self.scope_for(meeting_id) in self._shards
+
+    def get(self, meeting_id: Optional[str] = None) -> EvidenceManager:
+        """
+        The meeting's evidence, loading its shard from disk if needed. Loaded
+        shards are returned without waiting on any lock; a load only blocks
+        other callers asking for the same shard.
+        """
+        scope = self.scope_for(meeting_id)
+        manager = self._shards.get(scope)
+        if manager is None:
+            return self._load(scope)
+        self._last_used[scope] = time.monotonic()
+        if self._lock.acquire(blocking=False):  # Skipped when busy; the next call will do it
+            try:
+                self._evict_idle(keep=scope)
+            finally:
+                self._lock.release()
+        return manager
+
+    def _load(self, scope: str) -> EvidenceManager:
+        with self._lock:
+            load_lock = self._load_locks.setdefault(scope, threading.Lock())
+        with load_lock:
+            manager = self._shards.get(scope)
+            if manager is not None:
+                return manager  # Loaded by the caller we waited for
+            manager = self._create(scope)
+            with self._lock:
+                self._shards[scope] = manager
+                self.loads += 1
+                self._epochs[scope] = self.loads
+                self._last_used[scope] = time.monotonic()
+                self._load_locks.pop(scope, None)
+                self._evict_idle(keep=scope)
+        return manager
+
+    @contextmanager
+    def ingesting(self, meeting_id: Optional[str]):
+        """
+        Keep the meeting's shard loaded while an ingestion uses it: between
+        awaits it holds the manager it fetched, and a reloaded copy would
+        overwrite (or be overwritten by) what that manager saves
+        """
+        scope = self.scope_for(meeting_id)
+        with self._lock:
+            self._ingesting[scope] = self._ingesting.get(scope, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                if self._ingesting[scope] > 1:
+                    self._ingesting[scope] -= 1
+                else:
+                    del self._ingesting[scope]
+
+    def version(self, meeting_id: Optional[str], manager: EvidenceManager) -> tuple:
+        """Identifies the shard's current contents (generations restart when a shard is reloaded)"""
+        scope = self.scope_for(meeting_id)
+        return (scope, self._epochs.get(scope), manager.generation)
+
+    async def aget(self, meeting_id: Optional[str] = None) -> EvidenceManager:
+        """get() that loads unloaded shards off the event loop"""
+        if self.is_loaded(meeting_id):
+            return self.get(meeting_id)
+        return await asyncio.to_thread(self.get, meeting_id)
+
+    def _evict_idle(self, keep: str):
+        """Drop shards idle too long, or the least recently used beyond the cap; their data stays on disk"""
+        if not self.index_dir:
+            return  # Memory-only evidence cannot be reloaded
+        now = time.monotonic()
+        over = len(self._shards) - self.max_loaded
+        for scope in sorted(self._shards, key=lambda scope: self._last_used.get(scope, now)):  # Least recent first
+            manager = self._shards[scope]
+            idle = now - self._last_used.get(scope, now)
+            if scope in (GLOBAL_SHARD, keep) or (idle <= self.idle_seconds and over <= 0):
+                continue
+            if self._ingesting.get(scope) or manager.pending_documents or manager._build_lock.locked():
+                continue  # Mid-ingestion
+            del self._shards[scope]
+            self._last_used.pop(scope, None)
+            self._epochs.pop(scope, None)
+            over -= 1
+            self.evictions += 1
+            print(f"💤 Unloaded evidence shard {scope} (idle {idle:.0f}s)")
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "loaded": [
+                    {
+                        "shard": scope,
+                        "files": len(manager.file_chunks),
+                        "chunks": len(manager.chunks_by_id),
+                        "ingesting": self._ingesting.get(scope, 0),
+                        "idle_seconds": round(now - self._last_used.get(scope, now), 1)
+                    }
+                    for scope, manager in self._shards.items()
+                ],
+                "max_loaded": self.max_loaded,
+                "idle_seconds": self.idle_seconds,
+                "loads": self.loads,
+                "evictions": self.evictions
+            }
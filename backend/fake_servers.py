@@ -0,0 +1,126 @@
+"""
+Fake LLM / ASR Servers
+Local stand-ins for the Groq chat-completions API and Deepgram's listen API
+(HTTP and WebSocket) with deterministic output and configurable timing
+
+Run:
+    uvicorn fake_servers:app --port 9000
+
+Then start the backend against it:
+    LLM_BASE_URL=http://localhost:9000 GROQ_API_KEY=fake \\
+    DEEPGRAM_BASE_URL=http://localhost:9000 DEEPGRAM_API_KEY=fake \\
+    uvicorn main:app --port 8000
+
+Timing comes from FAKE_LLM_LATENCY_MS, FAKE_LLM_TOKENS_PER_SEC,
+FAKE_LLM_ANSWER_TOKENS and FAKE_ASR_LATENCY_MS (see providers.py).
+"""
+
+import json
+import time
+import uuid
+import asyncio
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+import providers
+from providers import FakeLiveConnection, fake_completion_text, fake_prerecorded_response, token_pieces
+
+app = FastAPI(title="Nyaya-Sahayak fake LLM/ASR")
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    """Groq/OpenAI-compatible chat completions, streaming or not"""
+    body = await request.json()
+    messages = body.get("messages", [])
+    model = body.get("model", "fake-model")
+    json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+    text = fake_completion_text(messages, body.get("max_tokens") or 500, json_mode)
+    pieces = token_pieces(text)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    created = int(time.time())
+    usage = {
+        "prompt_tokens": sum(len(m.get("content", "").split()) for m in messages),
+        "completion_tokens": len(pieces),
+        "total_tokens": sum(len(m.get("content", "").split()) for m in messages) + len(pieces)
+    }
+
+    await asyncio.sleep(providers.FAKE_LLM_LATENCY_MS / 1000)
+
+    if not body.get("stream"):
+        await asyncio.sleep(len(pieces) / providers.FAKE_LLM_TOKENS_PER_SEC)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop"
+            }],
+            "usage": usage
+        }
+
+    async def events():
+        for piece in pieces:
+            await asyncio.sleep(1 / providers.FAKE_LLM_TOKENS_PER_SEC)
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        final = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "x_groq": {"usage": usage}
+        }
+        yield f"data: {json.dumps(final)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.post("/v1/listen")
+async def listen_prerecorded(request: Request):
+    """Deepgram prerecorded transcription"""
+    audio = await request.body()
+    await asyncio.sleep(providers.FAKE_ASR_LATENCY_MS / 1000)
+    return fake_prerecorded_response(audio, "upload")
+
+
+@app.websocket("/v1/listen")
+async def listen_live(websocket: WebSocket):
+    """Deepgram live transcription: PCM in, interim/final Results messages out"""
+    await websocket.accept()
+    connection = FakeLiveConnection()
+
+    async def forward_results():
+        async for message in connection:
+            await websocket.send_text(message)
+
+    sender = asyncio.create_task(forward_results())
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes"):
+                await connection.send(message["bytes"])
+            elif message.get("text") and json.loads(message["text"]).get("type") == "CloseStream":
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await connection.close()
+        await asyncio.gather(sender, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=9000)
@@ -0,0 +1,129 @@
+"""
+Ingestion Queue
+Background evidence ingestion: an upload returns a job ID immediately and a
+pool of worker tasks takes each file through its stages, reporting progress
+per file while earlier files are already searchable
+"""
+
+import os
+import uuid
+import asyncio
+from datetime import datetime
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "2"))
+INGESTION_JOBS_MAX = int(os.getenv("INGESTION_JOBS_MAX", "200"))
+
+# A file moves through queued -> extracting | transcribing -> chunking ->
+# embedding -> indexed, or stops at failed
+FINAL_STATES = ("indexed", "failed")
+
+
+class IngestionJob:
+    def __init__(self, job_id: str, items: List[Dict]):
+        self.job_id = job_id
+        self.created_at = datetime.now().isoformat()
+        self.finished_at = None
+        self.files = [
+            {
+                "filename": item["filename"],
+                "type": item["type"],
+                "size": item["blob"]["size"],
+                "state": "queued",
+                "chunks": 0,
+                "timings": dict(item.get("timings", {}))
+            }
+            for item in items
+        ]
+        self.done = asyncio.Event()
+
+    @property
+    def state(self) -> str:
+        states = [f["state"] for f in self.files]
+        if any(state not in FINAL_STATES for state in states):
+            return "queued" if all(state == "queued" for state in states) else "processing"
+        if all(state == "failed" for state in states):
+            return "failed"
+        return "completed" if "failed" not in states else "completed_with_errors"
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.job_id,
+            "state": self.state,
+            "files_done": sum(1 for f in self.files if f["state"] in FINAL_STATES),
+            "files_total": len(self.files),
+            "files": self.files,
+            # Files whose content was already indexed (see "duplicate_of")
+            "skipped_bytes": sum(f.get("skipped_bytes", 0) for f in self.files),
+            "skipped_seconds": round(sum(f.get("skipped_seconds", 0) for f in self.files), 2),
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+
+class IngestionQueue:
+    """
+    `process_fn(item, status)` does the work for one file and updates the
+    file's live status dict (state, chunks, timings) as it goes.
+    """
+    def __init__(self, process_fn: Callable[[Dict, Dict], Awaitable[None]],
+                 workers: int = INGESTION_WORKERS, max_jobs: int = INGESTION_JOBS_MAX):
+        self.process_fn = process_fn
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """Start the worker tasks on the running event loop (idempotent)"""
+        if self._tasks:
+            return
+        self._queue = self._queue or asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        print(f"📥 Evidence ingestion queue started ({self.workers} workers)")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, items: List[Dict]) -> IngestionJob:
+        """Queue files (already in the blob store) for ingestion as one job"""
+        self.start()
+        job = IngestionJob(uuid.uuid4().hex[:12], items)
+        self.jobs[job.job_id] = job
+        while len(self.jobs) > self.max_jobs:
+            self.jobs.popitem(last=False)
+        for item, status in zip(items, job.files):
+            self._queue.put_nowait((job, item, status))
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        return self.jobs.get(job_id)
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job, item, status = await self._queue.get()
+            try:
+                await self.process_fn(item, status)
+                status["state"] = "indexed"
+            except Exception as e:
+                print(f"❌ Error ingesting {item['filename']}: {e}")
+                status["state"] = "failed"
+                status["error"] = str(e)
+            finally:
+                self._queue.task_done()
+                if all(f["state"] in FINAL_STATES for f in job.files) and not job.done.is_set():
+                    job.finished_at = datetime.now().isoformat()
+                    job.done.set()
+
+    def stats(self) -> Dict:
+        return {
+            "workers": len(self._tasks),
+            "queued_files": self._queue.qsize() if self._queue else 0,
+            "jobs": len(self.jobs),
+            "active_jobs": sum(1 for job in self.jobs.values() if not job.done.is_set())
+        }
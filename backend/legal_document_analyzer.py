@@ -4,23 +4,76 @@ Analyzes legal documents and provides simplified summaries using Groq AI
 """
 
 import os
-from typing import Dict, List, Optional
-from groq import Groq
+import re
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional
 from dotenv import load_dotenv
+from providers import create_chat_clients
+from single_flight import llm_single_flight, fingerprint
+from disk_cache import DiskCache, CACHE_DIR
 
 # Load environment variables
 load_dotenv()
 
+# Documents longer than this (characters) are analyzed in parallel parts
+ANALYZER_CHUNK_CHARS = int(os.getenv("ANALYZER_CHUNK_CHARS", "12000"))
+ANALYZER_MAX_PARALLEL = int(os.getenv("ANALYZER_MAX_PARALLEL", "4"))
+
+# Bump whenever the analysis prompts or merge logic change, so stale cached
+# analyses are not served
+ANALYSIS_PROMPT_VERSION = "2"
+ANALYSIS_CACHE_MAX_MB = int(os.getenv("ANALYSIS_CACHE_MAX_MB", "200"))
+
+# Zero-width split before headings like "Section 4", "ARTICLE II", "12.", "3.1 Payment" or "SCHEDULE A"
+SECTION_BOUNDARY = re.compile(
+    r"(?m)^(?=[ \t]*(?:(?i:section|article|clause|chapter|schedule|part|annexure)\s+[\dIVXLC]+\b"
+    r"|\d+(?:\.\d+)*[.)]?\s+[A-Z]"
+    r"|[A-Z][A-Z ,'&\-]{5,}$))"
+)
+
+
+def normalize_document(content: str) -> str:
+    """Canonical form for hashing: unified newlines, no trailing spaces, at most one blank line in a row"""
+    lines = [line.rstrip() for line in content.replace("\r\n", "\n").replace("\r", "\n").split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _dedupe(items: Iterable, key: Callable = None) -> List:
+    """Keep the first of each item, comparing case- and whitespace-insensitively"""
+    seen = set()
+    unique = []
+    for item in items:
+        value = key(item) if key else item
+        normalized = " ".join(str(value).lower().split())
+        if normalized and normalized not in seen:
+            seen.add(normalized)
+            unique.append(item)
+    return unique
+
 class LegalDocumentAnalyzer:
     def __init__(self):
         """Initialize the Legal Document Analyzer with Groq client"""
-        api_key = os.getenv('GROQ_API_KEY')
-        if not api_key:
+        try:
+            self.client, _ = create_chat_clients()
+        except ValueError:
             print("Warning: GROQ_API_KEY not found. Legal document analysis will not work.")
             self.client = None
-        else:
-            self.client = Groq(api_key=api_key)
         self.model = "llama-3.3-70b-versatile"
+        # Re-uploads of the same document are answered from disk
+        self.cache = DiskCache(os.path.join(CACHE_DIR, "analysis"), ANALYSIS_CACHE_MAX_MB * 1024 * 1024)
+    
+    def _cache_key(self, content: str) -> str:
+        """Content hash of the normalized document plus everything that shapes the analysis"""
+        digest = hashlib.sha256(normalize_document(content).encode("utf-8")).hexdigest()
+        return f"{digest}:{self.model}:v{ANALYSIS_PROMPT_VERSION}:{ANALYZER_CHUNK_CHARS}"
+    
+    def _complete(self, **request) -> str:
+        """Groq chat completion; identical concurrent requests share one upstream call"""
+        return llm_single_flight.do(
+            fingerprint(**request),
+            lambda: self.client.chat.completions.create(**request).choices[0].message.content
+        )
     
     def analyze_document(self, content: str) -> Dict:
         """
@@ -39,6 +92,42 @@ class LegalDocumentAnalyzer:
             - verifiableClaims: Claims that can be verified with links
         """
         
+        cache_key = self._cache_key(content)
+        cached = self.cache.get_json(cache_key)
+        if cached is not None:
+            print("⚡ Legal analysis served from cache")
+            cached['originalText'] = content
+            return cached
+        
+        if not self.client:
+            raise Exception("Groq API client not initialized. Check GROQ_API_KEY.")
+
+        try:
+            # Long documents are split on section boundaries and the parts
+            # analyzed in parallel, so wall time tracks the slowest part
+            # instead of growing with length (or overflowing the context)
+            parts = self._split_document(content)
+            if len(parts) == 1:
+                result = self._analyze_part(content)
+            else:
+                result = self._analyze_parts(parts)
+            
+            # Partial analyses are not cached so a retry can fill the gaps
+            if not result.get("failedParts"):
+                self.cache.put_json(cache_key, result)
+            
+            # Add original text for Q&A later
+            result['originalText'] = content
+            
+            return result
+            
+        except Exception as e:
+            print(f"Error analyzing document: {str(e)}")
+            raise Exception(f"Failed to analyze document: {str(e)}")
+    
+    def _analyze_part(self, content: str, part: int = 1, total_parts: int = 1) -> Dict:
+        """Run the analysis prompt over one document (or one part of a long document)"""
+        
         system_prompt = """You are an expert Legal Document Analyzer AI. Your task is to analyze legal documents and make them easy to understand for common people.
 
 Your analysis should:
@@ -65,7 +154,13 @@ You MUST respond with ONLY a valid JSON object (no markdown, no code blocks) wit
 
 Make everything clear and simple. Use Indian legal context when relevant."""
 
-        user_prompt = f"""Analyze the following legal document and provide a comprehensive breakdown:
+        if total_parts == 1:
+            intro = "Analyze the following legal document and provide a comprehensive breakdown:"
+        else:
+            intro = (f"Analyze PART {part} OF {total_parts} of a longer legal document and provide a comprehensive "
+                     f"breakdown of this part. Other parts are analyzed separately; do not speculate about them.")
+
+        user_prompt = f"""{intro}
 
 DOCUMENT:
 \"\"\"
@@ -74,41 +169,97 @@ DOCUMENT:
 
 Respond with ONLY the JSON object, no other text."""
 
-        if not self.client:
-            raise Exception("Groq API client not initialized. Check GROQ_API_KEY.")
-
-        try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                model=self.model,
-                temperature=0.3,
-                max_tokens=4000,
-                response_format={"type": "json_object"}
-            )
-            
-            import json
-            result_text = response.choices[0].message.content
-            result = json.loads(result_text)
-            
-            # Add original text for Q&A later
-            result['originalText'] = content
-            
-            return result
-            
-        except Exception as e:
-            print(f"Error analyzing document: {str(e)}")
-            raise Exception(f"Failed to analyze document: {str(e)}")
+        result_text = self._complete(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            model=self.model,
+            temperature=0.3,
+            max_tokens=4000,
+            response_format={"type": "json_object"}
+        )
+        
+        import json
+        return json.loads(result_text)
+    
+    def _split_document(self, content: str) -> List[str]:
+        """
+        Split a document into parts of at most ANALYZER_CHUNK_CHARS, cutting
+        at section headings where possible, then paragraphs, then hard limits
+        """
+        if len(content) <= ANALYZER_CHUNK_CHARS:
+            return [content]
+        
+        sections = [s for s in SECTION_BOUNDARY.split(content) if s.strip()]
+        
+        # Oversized sections fall back to paragraph boundaries, then hard cuts
+        pieces = []
+        for section in sections:
+            if len(section) <= ANALYZER_CHUNK_CHARS:
+                pieces.append(section)
+                continue
+            for paragraph in re.split(r"(?<=\n)\s*\n", section):
+                while len(paragraph) > ANALYZER_CHUNK_CHARS:
+                    pieces.append(paragraph[:ANALYZER_CHUNK_CHARS])
+                    paragraph = paragraph[ANALYZER_CHUNK_CHARS:]
+                if paragraph.strip():
+                    pieces.append(paragraph)
+        
+        # Pack consecutive pieces back up to the chunk size
+        parts = []
+        current = ""
+        for piece in pieces:
+            if current and len(current) + len(piece) > ANALYZER_CHUNK_CHARS:
+                parts.append(current)
+                current = ""
+            current += piece if not current else "\n" + piece
+        if current.strip():
+            parts.append(current)
+        return parts
+    
+    def _analyze_parts(self, parts: List[str]) -> Dict:
+        """Map: analyze parts concurrently (bounded). Reduce: merge and de-duplicate"""
+        print(f"📚 Analyzing long document in {len(parts)} parts ({ANALYZER_MAX_PARALLEL} at a time)")
+        total = len(parts)
+        results: List[Optional[Dict]] = [None] * total
+        errors = []
+        with ThreadPoolExecutor(max_workers=min(ANALYZER_MAX_PARALLEL, total)) as pool:
+            futures = {pool.submit(self._analyze_part, part, i + 1, total): i for i, part in enumerate(parts)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    print(f"⚠️ Part {i + 1}/{total} failed: {e}")
+                    errors.append(i + 1)
+        
+        analyzed = [r for r in results if r]
+        if not analyzed:
+            raise Exception("every part of the document failed to analyze")
+        
+        merged = {
+            "summary": "\n\n".join(r.get("summary", "") for r in analyzed if r.get("summary")),
+            "colorCodedOriginalText": "\n".join(r.get("colorCodedOriginalText", "") for r in analyzed),
+            "keyPoints": _dedupe(point for r in analyzed for point in r.get("keyPoints", [])),
+            "extraInfo": _dedupe(info for r in analyzed for info in r.get("extraInfo", [])),
+            "wordHelper": _dedupe((w for r in analyzed for w in r.get("wordHelper", [])), key=lambda w: w.get("term", "")),
+            "verifiableClaims": _dedupe((c for r in analyzed for c in r.get("verifiableClaims", [])), key=lambda c: c.get("claim", "")),
+            "parts": total
+        }
+        if errors:
+            merged["failedParts"] = sorted(errors)
+        return merged
     
-    def answer_question(self, question: str, document_text: str) -> Dict:
+    def answer_question(self, question: str, document_text: str, excerpts: bool = False) -> Dict:
         """
         Answer a question about the analyzed document
         
         Args:
             question: User's question
-            document_text: Original document text
+            document_text: Original document text, or the passages most
+                relevant to the question when excerpts is True
+            excerpts: Whether document_text holds selected passages only
             
         Returns:
             Dictionary with answer and suggestions
@@ -123,7 +274,12 @@ Respond with ONLY a valid JSON object (no markdown, no code blocks):
     "suggestions": ["Related question 1?", "Related question 2?"]
 }"""
 
-        user_prompt = f"""Based on this document, answer the question:
+        if excerpts:
+            intro = "Based on these excerpts from the document (the passages most relevant to the question), answer the question:"
+        else:
+            intro = "Based on this document, answer the question:"
+
+        user_prompt = f"""{intro}
 
 DOCUMENT:
 \"\"\"
@@ -138,7 +294,7 @@ Respond with ONLY the JSON object."""
             raise Exception("Groq API client not initialized. Check GROQ_API_KEY.")
 
         try:
-            response = self.client.chat.completions.create(
+            result_text = self._complete(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
@@ -150,7 +306,7 @@ Respond with ONLY the JSON object."""
             )
             
             import json
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(result_text)
             return result
             
         except Exception as e:
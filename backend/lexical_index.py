@@ -0,0 +1,113 @@
+"""
+Lexical Index
+BM25 over evidence chunks, kept in an inverted index addressed by the same
+chunk IDs as the vector index and updated incrementally with it
+
+Dense embeddings blur exact identifiers ("Section 420", FIR 123/2024, names);
+this index matches them term for term and needs no model call.
+"""
+
+import re
+import math
+import heapq
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+# Identifiers keep their inner separators: "123/2024", "420-a", "s.302"
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[./-][a-z0-9]+)*")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were what "
+    "when where which who why how with did does do any all about under".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def is_lexical_query(query: str, max_terms: int = 4) -> bool:
+    """Short lookups of an identifier (a section, FIR or exhibit number) that exact matching answers alone"""
+    terms = tokenize(query)
+    return 0 < len(terms) <= max_terms and any(any(ch.isdigit() for ch in term) for term in terms)
+
+
+def reciprocal_rank_fusion(rankings: List[List[Tuple[int, float]]], k: int, rrf_k: int = 60) -> List[Tuple[int, float]]:
+    """Merge ranked (chunk_id, score) lists by summing 1 / (rrf_k + rank); scores on different scales never mix"""
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, (chunk_id, _) in enumerate(ranking, start=1):
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (rrf_k + rank)
+    return heapq.nlargest(k, fused.items(), key=lambda item: item[1])
+
+
+class LexicalIndex:
+    """
+    Okapi BM25 (k1, b) with one postings dict per term. Adding or removing
+    a chunk touches only that chunk's terms; scores are computed at query
+    time from the postings of the query's terms.
+    """
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = {}  # Term -> chunk ID -> term frequency
+        self.doc_terms: Dict[int, List[str]] = {}  # Chunk ID -> its distinct terms, for removal
+        self.doc_lengths: Dict[int, int] = {}
+        self.total_length = 0
+        self._lock = threading.Lock()
+
+    def add(self, chunk_id: int, text: str):
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        with self._lock:
+            if chunk_id in self.doc_lengths:
+                self._remove(chunk_id)
+            for term, count in counts.items():
+                self.postings.setdefault(term, {})[chunk_id] = count
+            self.doc_terms[chunk_id] = list(counts)
+            self.doc_lengths[chunk_id] = len(tokens)
+            self.total_length += len(tokens)
+
+    def remove(self, chunk_ids: Iterable[int]):
+        with self._lock:
+            for chunk_id in chunk_ids:
+                self._remove(chunk_id)
+
+    def _remove(self, chunk_id: int):
+        for term in self.doc_terms.pop(chunk_id, []):
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(chunk_id, 0)
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """The k best-scoring chunk IDs with their BM25 scores (higher is better)"""
+        terms = set(tokenize(query))
+        with self._lock:
+            count = len(self.doc_lengths)
+            if not count or not terms:
+                return []
+            average_length = self.total_length / count or 1.0
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for chunk_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[chunk_id] / average_length)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def reset(self):
+        with self._lock:
+            self.postings = {}
+            self.doc_terms = {}
+            self.doc_lengths = {}
+            self.total_length = 0
+
+    def __len__(self):
+        return len(self.doc_lengths)
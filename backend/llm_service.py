@@ -1,21 +1,54 @@
 import os
-from groq import Groq
+import asyncio
+from typing import AsyncIterator
 from dotenv import load_dotenv
+from providers import create_chat_clients
+from single_flight import llm_single_flight, fingerprint
 
 load_dotenv()
 
+# Upper bound on Groq calls in flight at once and per-call deadline (seconds)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+
 
 class GroqLLMService:
     def __init__(self):
-        self.api_key = os.getenv("GROQ_API_KEY")
-        if not self.api_key:
-            raise ValueError("GROQ_API_KEY not found in environment")
-        
-        self.client = Groq(api_key=self.api_key)
+        # Groq by default; LLM_PROVIDER / LLM_BASE_URL select a local fake
+        self.client, self.async_client = create_chat_clients()
         self.model = "llama-3.3-70b-versatile"
+        self.timeout = LLM_TIMEOUT_SECONDS
+        self._semaphore = None  # Created lazily inside the running event loop
     
-    async def ask_question(self, question: str, context: str) -> str:
-        """Ask a question about the court session using LLM"""
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Bounded pool shared by all async LLM calls"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        return self._semaphore
+    
+    async def _complete(self, messages: list, temperature: float, max_tokens: int) -> str:
+        """
+        One chat completion through the bounded pool. Identical requests that
+        are already in flight share the same upstream call.
+        """
+        async def call():
+            async with self._get_semaphore():
+                response = await asyncio.wait_for(
+                    self.async_client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                    ),
+                    timeout=self.timeout
+                )
+            return response.choices[0].message.content
+        
+        key = fingerprint(model=self.model, messages=messages, temperature=temperature, max_tokens=max_tokens)
+        return await llm_single_flight.do_async(key, call)
+    
+    def _question_messages(self, question: str, context: str) -> list:
+        """Build the chat messages for a question about the court session"""
         
         system_prompt = """You are a legal assistant AI helping judges analyze court proceedings.
 You have access to the live transcript of the current session.
@@ -32,24 +65,92 @@ QUESTION: {question}
 Provide a clear, professional answer based on the transcript above.
 """
         
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+    
+    async def ask_question(self, question: str, context: str) -> str:
+        """Ask a question about the court session using LLM"""
+        
         try:
-            # Use Groq's chat completion
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+            # Async Groq call: waits in the bounded pool, then yields the event
+            # loop for the whole round trip. Cancelling the caller (e.g. the
+            # chat websocket closing) cancels the in-flight HTTP request.
+            return await self._complete(
+                self._question_messages(question, context),
                 temperature=0.3,  # Lower temperature for factual responses
-                max_tokens=500,
+                max_tokens=500
             )
-            
-            return response.choices[0].message.content
         
+        except asyncio.TimeoutError:
+            print(f"⏱️ LLM timed out after {self.timeout}s")
+            return f"Error processing question: the AI assistant did not respond within {self.timeout:g} seconds."
         except Exception as e:
             print(f"❌ LLM Error: {e}")
             return f"Error processing question: {str(e)}"
     
+    async def ask_question_stream(self, question: str, context: str) -> AsyncIterator[str]:
+        """Ask a question and yield the answer token by token as it is generated"""
+        
+        try:
+            async with self._get_semaphore():
+                stream = await asyncio.wait_for(
+                    self.async_client.chat.completions.create(
+                        model=self.model,
+                        messages=self._question_messages(question, context),
+                        temperature=0.3,
+                        max_tokens=500,
+                        stream=True,
+                    ),
+                    timeout=self.timeout
+                )
+                
+                # The deadline applies to the gap between tokens, so long
+                # answers are fine as long as the model keeps producing
+                chunks = stream.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), timeout=self.timeout)
+                    except StopAsyncIteration:
+                        break
+                    
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+        
+        except asyncio.TimeoutError:
+            print(f"⏱️ LLM stream stalled for {self.timeout}s")
+            yield f"\n\nError processing question: the AI assistant did not respond within {self.timeout:g} seconds."
+        except Exception as e:
+            print(f"❌ LLM Error: {e}")
+            yield f"Error processing question: {str(e)}"
+    
+    async def summarize_block(self, text: str, level: int) -> str:
+        """
+        Summarize one block of a live session for the rolling summary tree.
+        Level 0 is raw transcript lines; higher levels merge consecutive summaries.
+        """
+        if level == 0:
+            instruction = "Summarize these consecutive court session transcript statements."
+        else:
+            instruction = "Merge these consecutive summaries of one court session into a single summary."
+        
+        prompt = f"""{instruction}
+Keep who said what, arguments, evidence referred to, admissions, and any
+procedural decisions. Be factual and concise (at most 200 words).
+
+{text}
+"""
+        
+        return await self._complete(
+            [
+                {"role": "system", "content": "You are a legal document summarizer."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.2,
+            max_tokens=400
+        )
+    
     def summarize_session(self, transcript: str) -> str:
         """Generate a summary of the court session"""
         
@@ -1,20 +1,33 @@
+import time
+IMPORT_STARTED = time.perf_counter()  # Startup timing, logged once startup completes
+
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, FileResponse
+import os
 import json
 import asyncio
 import hashlib
 from datetime import datetime
 from typing import List, Dict, Optional
-from io import BytesIO
-from deepgram_service import DeepgramTranscriber
+from providers import create_transcriber
 from llm_service import GroqLLMService
-from evidence_service import EvidenceManager
+from evidence_service import embedding_cache
+from evidence_shards import EvidenceShards, InvalidMeetingId
 from meeting_service import MeetingManager
 from criminal_records_service import criminal_records_manager
 from report_service import report_generator
 from legal_document_analyzer import legal_document_analyzer
 from auth_service import auth_service
+from answer_cache import answer_cache, transcript_version
+from context_builder import chat_context_builder
+from single_flight import llm_single_flight
+from document_sessions import document_session_store
+from ingestion_queue import IngestionQueue
+from text_extraction import extract_pages_async, shutdown_extraction_pool, DOCUMENT_EXTENSIONS
+from model_warmup import model_warmup
+
+startup_timings = {"import_ms": round((time.perf_counter() - IMPORT_STARTED) * 1000, 1)}
 
 app = FastAPI()
 
@@ -30,10 +43,11 @@ app.add_middleware(
 # Store transcripts in memory (for demo - backward compatibility)
 session_transcript = []
 llm_service = GroqLLMService()
-evidence_manager = EvidenceManager()
+# Evidence is indexed per meeting; uploads without a meeting ID go to a global shard
+evidence_shards = EvidenceShards()
 
-# Meeting system (new)
-meeting_manager = MeetingManager()
+# Meeting system (new) - each meeting keeps a rolling summary of its transcript
+meeting_manager = MeetingManager(summarize_fn=llm_service.summarize_block)
 
 # Store WebSocket connections per meeting
 meeting_connections: Dict[str, Dict[str, WebSocket]] = {}
@@ -42,6 +56,55 @@ meeting_connections: Dict[str, Dict[str, WebSocket]] = {}
 signaling_connections: Dict[str, Dict[str, WebSocket]] = {}
 
 
+@app.on_event("startup")
+async def start_model_warmup():
+    """Load the embedding model and text splitter in the background (EVIDENCE_WARMUP=true)"""
+    startup_timings["startup_started"] = time.perf_counter()
+    model_warmup.start()
+
+
+@app.on_event("startup")
+async def load_evidence_index():
+    """Restore global evidence saved by a previous run; meeting shards load on first use"""
+    await evidence_shards.aget(None)
+
+
+@app.exception_handler(InvalidMeetingId)
+async def invalid_meeting_id_handler(request: Request, exc: InvalidMeetingId):
+    return JSONResponse(
+        status_code=400,
+        content={"error": str(exc)}
+    )
+
+
+@app.on_event("startup")
+async def start_evidence_ingestion():
+    evidence_ingestion.start()
+
+
+@app.on_event("startup")
+async def log_startup_timing():
+    startup_timings["startup_ms"] = round((time.perf_counter() - startup_timings.pop("startup_started")) * 1000, 1)
+    print(f"⏱️ Backend imported in {startup_timings['import_ms']} ms, started in {startup_timings['startup_ms']} ms"
+          f"{' (models warming up in the background)' if model_warmup.enabled else ''}")
+
+
+@app.get("/ready")
+async def readiness():
+    """200 once the embedding model and text splitter are loaded (always, when warm-up is off), else 503"""
+    status = {**model_warmup.status(), "startup": startup_timings}
+    return JSONResponse(
+        status_code=200 if status["ready"] else 503,
+        content=status
+    )
+
+
+@app.on_event("shutdown")
+async def stop_evidence_ingestion():
+    await evidence_ingestion.stop()
+    shutdown_extraction_pool()
+
+
 @app.get("/")
 async def root():
     return {"message": "Nyaya-Sahayak Backend Running"}
@@ -175,6 +238,22 @@ async def get_meeting_transcript(meeting_id: str):
     }
 
 
+@app.get("/meeting/{meeting_id}/summary")
+async def get_meeting_summary(meeting_id: str):
+    """Get the rolling summary of the meeting so far"""
+    meeting = meeting_manager.get_meeting(meeting_id.upper())
+    if not meeting:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Meeting not found"}
+        )
+    
+    return {
+        "meeting_id": meeting.meeting_id,
+        "summary": meeting.get_session_summary()
+    }
+
+
 @app.post("/meeting/{meeting_id}/leave")
 async def leave_meeting(meeting_id: str, data: dict):
     """Leave a meeting"""
@@ -206,7 +285,7 @@ async def websocket_transcribe(websocket: WebSocket, meeting_id: str, user_id: s
         await websocket.close(code=4004, reason="Meeting or user not found")
         return
     
-    transcriber = DeepgramTranscriber()
+    transcriber = create_transcriber()
     
     try:
         print(f"🎤 WebSocket connected - Starting transcription for {user.name} in {meeting_id}...")
@@ -332,50 +411,79 @@ async def websocket_chat(websocket: WebSocket):
     """Chat interface for asking questions about the session"""
     await websocket.accept()
     
+    # Questions are answered by a separate task so the receive loop keeps
+    # noticing disconnects while an LLM call is still in flight
+    questions: asyncio.Queue = asyncio.Queue()
+    
+    async def answer_questions():
+        while True:
+            data = await questions.get()
+            question = data.get("question", "")
+            meeting_id = data.get("meeting_id")
+            try:
+                print(f"💬 Question: {question}")
+                
+                # Repeat questions over unchanged inputs are answered from cache
+                evidence_manager = await evidence_shards.aget(meeting_id)
+                cache_key = chat_cache_key("ws", question, meeting_id, evidence_manager)
+                cached = answer_cache.get(cache_key)
+                if cached is not None:
+                    await websocket.send_json({
+                        "type": "answer",
+                        "data": {
+                            "question": question,
+                            "answer": cached,
+                            "cached": True
+                        }
+                    })
+                    continue
+                
+                context = await build_chat_context(question, evidence_manager, include_records=False, meeting_id=meeting_id)
+                
+                # Stream the answer as it is generated, then send the full text
+                response = ""
+                async for delta in llm_service.ask_question_stream(question, context.text):
+                    response += delta
+                    await websocket.send_json({
+                        "type": "answer_delta",
+                        "data": {
+                            "question": question,
+                            "delta": delta
+                        }
+                    })
+                
+                cache_answer(cache_key, response)
+                
+                # Send response back to frontend
+                await websocket.send_json({
+                    "type": "answer",
+                    "data": {
+                        "question": question,
+                        "answer": response,
+                        "context_tokens": context.usage["total_tokens"]
+                    }
+                })
+                
+                print(f"🤖 Answer: {response}")
+            
+            except Exception as e:
+                print(f"Chat error: {e}")
+    
+    answer_task = asyncio.create_task(answer_questions())
+    
     try:
         while True:
             # Receive question from frontend
             data = await websocket.receive_json()
-            question = data.get("question", "")
-            
-            print(f"💬 Question: {question}")
-            
-            # Prepare context from session transcript
-            transcript_context = "\n".join([
-                f"[{entry['timestamp']}] {entry['speaker']}: {entry['text']}"
-                for entry in session_transcript
-            ])
-            
-            # Get relevant evidence
-            evidence_context = ""
-            if evidence_manager.vector_store:
-                evidence_results = evidence_manager.search_evidence(question, k=3)
-                if evidence_results:
-                    evidence_context = "\n\nRELEVANT EVIDENCE:\n"
-                    for i, result in enumerate(evidence_results, 1):
-                        evidence_context += f"\n[Evidence {i} from {result['filename']}]:\n{result['content']}\n"
-            
-            # Combine all context
-            full_context = transcript_context + evidence_context
-            
-            # Get response from LLM
-            response = await llm_service.ask_question(question, full_context)
-            
-            # Send response back to frontend
-            await websocket.send_json({
-                "type": "answer",
-                "data": {
-                    "question": question,
-                    "answer": response
-                }
-            })
-            
-            print(f"🤖 Answer: {response}")
+            await questions.put(data)
     
     except WebSocketDisconnect:
         print("Chat WebSocket disconnected")
     except Exception as e:
         print(f"Chat error: {e}")
+    finally:
+        # Abandon any pending LLM call for a client that is gone
+        answer_task.cancel()
 
 
 @app.websocket("/ws/signaling/{meeting_id}/{user_id}")
@@ -462,81 +570,212 @@ async def clear_transcript():
     return {"message": "Transcript cleared"}
 
 
+AUDIO_EXTENSIONS = ['mp3', 'wav', 'm4a', 'ogg', 'webm']
+
+
+def elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+# (shard, sha256) of files being ingested, so identical files in flight are processed once
+ingesting_blobs: Dict[tuple, asyncio.Event] = {}
+
+
+async def process_evidence_upload(item: Dict, status: Dict):
+    """
+    Process one queued upload, then end its hold on its blob: the blob is
+    deleted if ingestion failed and no file refers to it. The meeting's shard
+    stays loaded throughout, so the manager fetched along the way stays current
+    """
+    with evidence_shards.ingesting(item["meeting_id"]):
+        try:
+            await process_evidence_file(item, status)
+        finally:
+            (await evidence_shards.aget(item["meeting_id"])).release_upload(item["blob"]["sha256"])
+
+
+async def process_evidence_file(item: Dict, status: Dict):
+    """
+    Ingest one stored upload, unless the meeting already has a file with the
+    same bytes: then the upload becomes an alias of that file, sharing its
+    chunks and transcript, and the bytes and seconds skipped are reported
+    """
+    filename = item["filename"]
+    sha256 = item["blob"]["sha256"]
+    key = (evidence_shards.scope_for(item["meeting_id"]), sha256)
+    while key in ingesting_blobs:
+        await ingesting_blobs[key].wait()
+    
+    evidence_manager = await evidence_shards.aget(item["meeting_id"])
+    duplicate = evidence_manager.find_duplicate(sha256)
+    if duplicate:
+        if duplicate != filename:
+            if filename in evidence_manager.file_storage:
+                await asyncio.to_thread(evidence_manager.remove_file, filename)  # Name reused for other content
+            evidence_manager.add_alias(filename, duplicate, item["blob"])
+        status["duplicate_of"] = duplicate
+        status["chunks"] = len(evidence_manager.file_chunks.get(duplicate, []))
+        status["skipped_bytes"] = item["blob"]["size"]
+        status["skipped_seconds"] = evidence_manager.file_storage[duplicate].get("ingest_seconds", 0)
+        print(f"♻️ {filename} has the same content as {duplicate}; reusing its evidence")
+        return
+    
+    ingesting_blobs[key] = asyncio.Event()
+    try:
+        started = time.perf_counter()
+        await ingest_evidence_file(item, status)
+        (await evidence_shards.aget(item["meeting_id"])).set_ingest_seconds(filename, time.perf_counter() - started)
+    finally:
+        ingesting_blobs.pop(key).set()
+
+
+async def ingest_evidence_file(item: Dict, status: Dict):
+    """
+    Extract or transcribe, chunk, embed and index one stored upload, updating
+    its ingestion status (state, chunks, per-stage timings) as it goes
+    """
+    filename = item["filename"]
+    blob = item["blob"]
+    blob_path = item["blob_path"]
+    timings = status["timings"]
+    
+    # Check if audio file
+    if item["type"] == "audio":
+        # Transcribe audio file, streaming it from disk
+        print(f"🎵 Transcribing audio: {filename}...")
+        status["state"] = "transcribing"
+        started = time.perf_counter()
+        transcriber = create_transcriber()
+        
+        def transcribe():
+            with open(blob_path, "rb") as audio:
+                return transcriber.transcribe_file(audio, filename)
+        
+        transcript_result = await asyncio.to_thread(transcribe)
+        timings["transcribe_ms"] = elapsed_ms(started)
+        
+        # Extract transcript text
+        transcript_text = ""
+        if "results" in transcript_result and "channels" in transcript_result["results"]:
+            channels = transcript_result["results"]["channels"]
+            if len(channels) > 0 and "alternatives" in channels[0]:
+                alternatives = channels[0]["alternatives"]
+                if len(alternatives) > 0:
+                    transcript_text = alternatives[0].get("transcript", "")
+        
+        if not transcript_text:
+            raise ValueError("No transcript generated")
+        
+        # Add to the meeting's evidence (looked up only now: idle shards may have been unloaded meanwhile)
+        status["state"] = "chunking"
+        started = time.perf_counter()
+        evidence_manager = await evidence_shards.aget(item["meeting_id"])
+        if filename in evidence_manager.file_storage:
+            await asyncio.to_thread(evidence_manager.remove_file, filename)  # Replaced by new content
+        # Splitting may wait on the text splitter's first load (or warm-up): off the event loop
+        num_chunks = await asyncio.to_thread(
+            evidence_manager.add_audio_transcript,
+            filename,
+            transcript_text,
+            transcript_result,
+            blob
+        )
+        timings["chunk_ms"] = elapsed_ms(started)
+        status["has_transcript"] = True
+        print(f"🎵 Audio transcribed: {filename} ({num_chunks} chunks)")
+    else:
+        # Process document/image in the extraction worker pool
+        status["state"] = "extracting"
+        extraction = await extract_pages_async(None, item["extension"], path=blob_path)
+        timings["extract_ms"] = round(extraction["seconds"] * 1000, 1)
+        status["pages"] = len(extraction["pages"])
+        status["ocr_pages"] = extraction["ocr_pages"]
+        
+        status["state"] = "chunking"
+        started = time.perf_counter()
+        evidence_manager = await evidence_shards.aget(item["meeting_id"])
+        chunks = await asyncio.to_thread(evidence_manager.split_pages, extraction["pages"])
+        if filename in evidence_manager.file_storage:
+            await asyncio.to_thread(evidence_manager.remove_file, filename)  # Replaced by new content
+        num_chunks = evidence_manager.add_document(filename, chunks, blob, "document", pages=len(extraction["pages"]))
+        timings["chunk_ms"] = elapsed_ms(started)
+        print(f"📄 Processed: {filename} ({len(extraction['pages'])} pages, "
+              f"{extraction['ocr_pages']} OCR, {num_chunks} chunks)")
+    
+    status["chunks"] = num_chunks
+    
+    # Embed and index now, so this file is searchable before the rest of the job finishes
+    status["state"] = "embedding"
+    started = time.perf_counter()
+    await asyncio.to_thread(evidence_manager.build_vector_store)
+    timings["index_ms"] = elapsed_ms(started)
+
+
+evidence_ingestion = IngestionQueue(process_evidence_upload)
+
+
 @app.post("/evidence/upload")
-async def upload_evidence(files: List[UploadFile] = File(...)):
-    """Upload multiple evidence files (PDF, images, or audio)"""
+async def upload_evidence(files: List[UploadFile] = File(...), wait: bool = False, meeting_id: Optional[str] = None):
+    """
+    Upload multiple evidence files (PDF, images, or audio) to a meeting's
+    evidence (?meeting_id=...), or to the global evidence without one
+    
+    Files are stored and queued for background ingestion; the response
+    (202) carries a job ID to poll at GET /evidence/jobs/{job_id}. With
+    ?wait=true the request returns only once every file has been indexed.
+    """
+    evidence_manager = await evidence_shards.aget(meeting_id)
     try:
-        processed_files = []
-        
+        # Validate file types before doing any work
         for file in files:
-            # Validate file type
             file_ext = file.filename.lower().split('.')[-1]
-            
-            # Read file content
-            content = await file.read()
-            
-            # Check if audio file
-            if file_ext in ['mp3', 'wav', 'm4a', 'ogg', 'webm']:
-                # Transcribe audio file
-                print(f"🎵 Transcribing audio: {file.filename}...")
-                transcriber = DeepgramTranscriber()
-                transcript_result = transcriber.transcribe_file(content, file.filename)
-                
-                # Extract transcript text
-                transcript_text = ""
-                if "results" in transcript_result and "channels" in transcript_result["results"]:
-                    channels = transcript_result["results"]["channels"]
-                    if len(channels) > 0 and "alternatives" in channels[0]:
-                        alternatives = channels[0]["alternatives"]
-                        if len(alternatives) > 0:
-                            transcript_text = alternatives[0].get("transcript", "")
-                
-                if transcript_text:
-                    # Add to evidence manager
-                    num_chunks = evidence_manager.add_audio_transcript(
-                        file.filename, 
-                        transcript_text,
-                        transcript_result
-                    )
-                    processed_files.append({
-                        "filename": file.filename,
-                        "type": "audio",
-                        "chunks": num_chunks,
-                        "has_transcript": True
-                    })
-                    print(f"🎵 Audio transcribed: {file.filename} ({num_chunks} chunks)")
-                else:
-                    processed_files.append({
-                        "filename": file.filename,
-                        "type": "audio",
-                        "chunks": 0,
-                        "has_transcript": False,
-                        "error": "No transcript generated"
-                    })
-            
-            elif file_ext in ['pdf', 'jpg', 'jpeg', 'png', 'bmp', 'tiff']:
-                # Process document/image
-                num_chunks = evidence_manager.process_file(content, file.filename, "document")
-                processed_files.append({
-                    "filename": file.filename,
-                    "type": "document",
-                    "chunks": num_chunks
-                })
-                print(f"📄 Processed: {file.filename} ({num_chunks} chunks)")
-            else:
+            if file_ext not in AUDIO_EXTENSIONS and file_ext not in DOCUMENT_EXTENSIONS:
                 return JSONResponse(
                     status_code=400,
                     content={"error": f"Unsupported file type: {file.filename}"}
                 )
         
-        # Build vector store
-        evidence_manager.build_vector_store()
+        # Stream each upload into the blob store; the rest happens in the background.
+        # Each blob is held until its file is processed, so removing another file
+        # with the same bytes meanwhile does not delete it
+        items = []
+        for file in files:
+            file_ext = file.filename.lower().split('.')[-1]
+            started = time.perf_counter()
+            try:
+                blob = await asyncio.to_thread(evidence_manager.blob_store.put_stream, file.file, True)
+            except Exception:
+                for item in items:
+                    evidence_manager.release_upload(item["blob"]["sha256"])
+                raise
+            items.append({
+                "filename": file.filename,
+                "extension": file_ext,
+                "type": "audio" if file_ext in AUDIO_EXTENSIONS else "document",
+                "blob": blob,
+                "blob_path": evidence_manager.blob_store.path(blob["sha256"]),
+                "meeting_id": meeting_id,
+                "timings": {"store_ms": elapsed_ms(started)}
+            })
         
-        return {
-            "message": f"Successfully processed {len(files)} evidence file(s)",
-            "files": processed_files,
-            "total_documents": len(evidence_manager.documents)
-        }
+        job = evidence_ingestion.submit(items)
+        
+        if wait:
+            await job.done.wait()
+            return {
+                "message": f"Processed {len(files)} evidence file(s)",
+                **job.to_dict(),
+                "total_documents": len((await evidence_shards.aget(meeting_id)).chunks_by_id)
+            }
+        
+        return JSONResponse(
+            status_code=202,
+            content={
+                "message": f"Queued {len(files)} evidence file(s)",
+                **job.to_dict(),
+                "status_url": f"/evidence/jobs/{job.job_id}"
+            }
+        )
     
     except Exception as e:
         print(f"❌ Error uploading evidence: {e}")
@@ -546,31 +785,44 @@ async def upload_evidence(files: List[UploadFile] = File(...)):
         )
 
 
+@app.get("/evidence/jobs/{job_id}")
+async def get_ingestion_job(job_id: str):
+    """Per-file progress of an evidence upload"""
+    job = evidence_ingestion.get(job_id)
+    if not job:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Job not found"}
+        )
+    return job.to_dict()
+
+
+@app.get("/evidence/jobs")
+async def list_ingestion_jobs():
+    """Recent evidence upload jobs and queue depth"""
+    return {
+        "jobs": [
+            {"job_id": job.job_id, "state": job.state, "files_total": len(job.files), "created_at": job.created_at}
+            for job in reversed(evidence_ingestion.jobs.values())
+        ],
+        **evidence_ingestion.stats()
+    }
+
+
 @app.get("/evidence")
-async def get_evidence():
-    """Get list of all uploaded evidence"""
-    filenames = list(set([doc["filename"] for doc in evidence_manager.documents]))
-    
-    # Add file type info
-    file_list = []
-    for filename in filenames:
-        file_ext = filename.lower().split('.')[-1]
-        is_audio = file_ext in ['mp3', 'wav', 'm4a', 'ogg', 'webm']
-        file_list.append({
-            "filename": filename,
-            "type": "audio" if is_audio else "document",
-            "has_transcript": filename in evidence_manager.audio_transcripts
-        })
-    
+async def get_evidence(meeting_id: Optional[str] = None):
+    """Get list of all uploaded evidence (type, size, pages, chunks, hash and synopsis per file)"""
+    evidence_manager = await evidence_shards.aget(meeting_id)
     return {
-        "files": file_list,
-        "total_chunks": len(evidence_manager.documents)
+        "files": evidence_manager.list_files(),
+        "total_chunks": len(evidence_manager.chunks_by_id)
     }
 
 
 @app.get("/evidence/transcript/{filename}")
-async def get_audio_transcript(filename: str):
+async def get_audio_transcript(filename: str, meeting_id: Optional[str] = None):
     """Get transcript for a specific audio file"""
+    evidence_manager = await evidence_shards.aget(meeting_id)
     transcript = evidence_manager.get_audio_transcript(filename)
     if transcript:
         return {
@@ -586,17 +838,17 @@ async def get_audio_transcript(filename: str):
 
 
 @app.get("/evidence/download/{filename}")
-async def download_evidence(filename: str):
+async def download_evidence(filename: str, meeting_id: Optional[str] = None):
     """Download an evidence file"""
-    if filename not in evidence_manager.file_storage:
+    evidence_manager = await evidence_shards.aget(meeting_id)
+    file_path = evidence_manager.get_file_path(filename)
+    if not file_path or not os.path.exists(file_path):
         return JSONResponse(
             status_code=404,
             content={"error": "File not found"}
         )
     
-    file_data = evidence_manager.file_storage[filename]
-    file_content = file_data["content"]
-    file_ext = file_data["extension"]
+    file_ext = evidence_manager.file_storage[filename]["extension"]
     
     # Determine MIME type
     mime_types = {
@@ -615,43 +867,32 @@ async def download_evidence(filename: str):
     
     media_type = mime_types.get(file_ext, "application/octet-stream")
     
-    return StreamingResponse(
-        BytesIO(file_content),
+    # Served from disk in chunks; supports Range requests for seeking in audio
+    return FileResponse(
+        file_path,
         media_type=media_type,
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        }
+        filename=filename
     )
 
 
 @app.post("/clear-evidence")
-async def clear_evidence():
-    """Clear all evidence"""
-    evidence_manager.clear_evidence()
+async def clear_evidence(meeting_id: Optional[str] = None):
+    """Clear all evidence of a meeting (or the global evidence)"""
+    evidence_manager = await evidence_shards.aget(meeting_id)
+    await asyncio.to_thread(evidence_manager.clear_evidence)
     return {"message": "Evidence cleared"}
 
 
 @app.delete("/evidence/{filename}")
-async def delete_evidence(filename: str):
+async def delete_evidence(filename: str, meeting_id: Optional[str] = None):
     """Delete a specific evidence file"""
+    evidence_manager = await evidence_shards.aget(meeting_id)
     try:
-        # Remove documents with matching filename
-        evidence_manager.documents = [
-            doc for doc in evidence_manager.documents 
-            if doc["filename"] != filename
-        ]
-        
-        # Remove audio transcript if exists
-        if filename in evidence_manager.audio_transcripts:
-            del evidence_manager.audio_transcripts[filename]
-        
-        # Rebuild vector store if documents remain
-        if evidence_manager.documents:
-            evidence_manager.build_vector_store()
-        else:
-            evidence_manager.vector_store = None
+        # Remove the file's chunks, vectors, transcript and stored bytes; off the event loop,
+        # since it waits for a running build and may rebuild an HNSW graph
+        removed_chunks = await asyncio.to_thread(evidence_manager.remove_file, filename)
         
-        return {"message": f"Deleted {filename}"}
+        return {"message": f"Deleted {filename}", "chunks_removed": removed_chunks}
     except Exception as e:
         return JSONResponse(
             status_code=500,
@@ -659,6 +900,28 @@ async def delete_evidence(filename: str):
         )
 
 
+@app.get("/evidence/embedding-cache/stats")
+async def embedding_cache_stats():
+    """Hit rates of the chunk embedding cache (memory and disk tiers)"""
+    return embedding_cache.stats()
+
+
+@app.get("/evidence/index/stats")
+async def evidence_index_stats(meeting_id: Optional[str] = None):
+    """Vector index type, size and memory per vector, and keyword index size"""
+    evidence_manager = await evidence_shards.aget(meeting_id)
+    return {
+        "vector": evidence_manager.vector_store.stats(),
+        "lexical_chunks": len(evidence_manager.lexical_index)
+    }
+
+
+@app.get("/evidence/shards/stats")
+async def evidence_shard_stats():
+    """Evidence shards currently loaded in memory"""
+    return evidence_shards.stats()
+
+
 @app.post("/search-evidence")
 async def search_evidence(query: dict):
     """Search evidence for relevant information"""
@@ -666,7 +929,8 @@ async def search_evidence(query: dict):
     if not q:
         return {"error": "Query is required"}
     
-    results = evidence_manager.search_evidence(q, k=5)
+    evidence_manager = await evidence_shards.aget(query.get("meeting_id"))
+    results = await asyncio.to_thread(evidence_manager.search_evidence, q, 5)
     return {"results": results}
 
 
@@ -762,7 +1026,8 @@ async def generate_report(data: dict):
         meeting_data = {
             "meeting_id": meeting_id,
             "transcript": meeting.transcript,
-            "evidence": evidence_manager.get_evidence_list(),
+            "session_summary": meeting.get_session_summary(),
+            "evidence": (await evidence_shards.aget(meeting_id)).get_evidence_list(),
             "criminal_records": data.get("criminal_records_checked", []),
             "chat_history": data.get("chat_history", []),
             "judge_statement": judge_statement,
@@ -771,8 +1036,9 @@ async def generate_report(data: dict):
             "duration": data.get("duration", "N/A")
         }
         
-        # Generate report
-        report = report_generator.generate_report_content(meeting_data)
+        # Generate report (in a worker thread so identical concurrent
+        # requests can overlap and share one LLM call)
+        report = await asyncio.to_thread(report_generator.generate_report_content, meeting_data)
         
         if not report:
             return JSONResponse(
@@ -815,6 +1081,59 @@ async def generate_report(data: dict):
         )
 
 
+def chat_transcript(meeting_id: Optional[str] = None):
+    """Transcript and rolling summary a chat question is about: a meeting's, or the global session's"""
+    meeting = meeting_manager.get_meeting(meeting_id.upper()) if meeting_id else None
+    if meeting:
+        return meeting.transcript, meeting.get_session_summary()
+    return session_transcript, None
+
+
+def chat_cache_key(scope: str, question: str, meeting_id: Optional[str], evidence_manager) -> tuple:
+    """Answer-cache key for a question over the meeting's current transcript, evidence and records"""
+    return answer_cache.make_key(
+        scope,
+        question,
+        transcript_version(chat_transcript(meeting_id)[0]),
+        evidence_shards.version(meeting_id, evidence_manager),
+        criminal_records_manager.revision
+    )
+
+
+def cache_answer(cache_key: tuple, answer: str):
+    """Cache an LLM answer unless it is an error message"""
+    if answer and not answer.startswith("Error processing question") and "\n\nError processing question" not in answer:
+        answer_cache.put(cache_key, answer)
+
+
+async def build_chat_context(message: str, evidence_manager, include_records: bool = True, meeting_id: Optional[str] = None):
+    """
+    Assemble transcript, evidence (the meeting's own shard) and criminal
+    records context for a chat message within the chat token budget
+    """
+    transcript, session_summary = chat_transcript(meeting_id)
+    
+    # Get evidence context
+    evidence_results = []
+    if evidence_manager.chunks_by_id:
+        # Embedding the query can wait on the model (or its warm-up): keep it off the event loop
+        evidence_results = await asyncio.to_thread(evidence_manager.search_evidence, message, 3)
+    
+    # Get criminal records context: records named in the question, or the
+    # whole database (budget permitting) for generic record questions
+    records = []
+    if include_records:
+        records = criminal_records_manager.find_mentioned_records(message)
+        record_keywords = ['criminal', 'record', 'crime', 'flagged', 'history', 'conviction', 'assault', 'theft', 'fraud']
+        if not records and any(keyword in message.lower() for keyword in record_keywords):
+            records = criminal_records_manager.get_all_records()
+    
+    context = chat_context_builder.build(transcript, evidence_results, records, session_summary)
+    print(f"🧮 Context tokens: {context.usage['total_tokens']}/{context.usage['budget']} "
+          f"({context.usage['transcript_lines']} lines, {context.usage['evidence_chunks']} evidence, {context.usage['records']} records)")
+    return context
+
+
 @app.post("/chat")
 async def chat(data: dict):
     """Chat with AI assistant using Groq LLM"""
@@ -826,36 +1145,20 @@ async def chat(data: dict):
                 content={"error": "Message is required"}
             )
         
-        # Get transcript context
-        transcript_context = ""
-        if session_transcript:
-            transcript_context = "TRANSCRIPT:\n"
-            for entry in session_transcript:
-                transcript_context += f"[{entry['timestamp']}] {entry.get('speaker', 'Speaker')}: {entry['text']}\n"
-        
-        # Get evidence context
-        evidence_context = ""
-        if evidence_manager.vector_store:
-            evidence_results = evidence_manager.search_evidence(message, k=3)
-            if evidence_results:
-                evidence_context = "\n\nRELEVANT EVIDENCE:\n"
-                for i, result in enumerate(evidence_results, 1):
-                    evidence_context += f"\n[Evidence {i} from {result['filename']}]:\n{result['content']}\n"
-        
-        # Get criminal records context
-        criminal_records_context = ""
-        # Check if question mentions criminal records, names, or record-related keywords
-        record_keywords = ['criminal', 'record', 'crime', 'flagged', 'history', 'conviction', 'assault', 'theft', 'fraud']
-        if any(keyword in message.lower() for keyword in record_keywords):
-            criminal_records_context = "\n\n" + criminal_records_manager.get_all_records_text()
+        meeting_id = data.get("meeting_id")
+        evidence_manager = await evidence_shards.aget(meeting_id)
+        cache_key = chat_cache_key("chat", message, meeting_id, evidence_manager)
+        cached = answer_cache.get(cache_key)
+        if cached is not None:
+            return {"response": cached, "cached": True}
         
-        # Combine context
-        full_context = transcript_context + evidence_context + criminal_records_context
+        context = await build_chat_context(message, evidence_manager, meeting_id=meeting_id)
         
         # Get response from Groq LLM
-        response = await llm_service.ask_question(message, full_context)
+        response = await llm_service.ask_question(message, context.text)
+        cache_answer(cache_key, response)
         
-        return {"response": response}
+        return {"response": response, "context_usage": context.usage}
     
     except Exception as e:
         print(f"❌ Chat error: {e}")
@@ -865,6 +1168,70 @@ async def chat(data: dict):
         )
 
 
+@app.post("/chat/stream")
+async def chat_stream(data: dict):
+    """
+    Chat with AI assistant, streaming the answer as Server-Sent Events
+    
+    Emits one `data: {"delta": "..."}` event per token batch, then a final
+    `event: done` whose data is `{"response": "<full answer>"}`.
+    """
+    try:
+        message = data.get("message", "")
+        if not message:
+            return JSONResponse(
+                status_code=400,
+                content={"error": "Message is required"}
+            )
+        
+        meeting_id = data.get("meeting_id")
+        evidence_manager = await evidence_shards.aget(meeting_id)
+        cache_key = chat_cache_key("chat", message, meeting_id, evidence_manager)
+        cached = answer_cache.get(cache_key)
+        
+        async def event_stream():
+            if cached is not None:
+                yield f"data: {json.dumps({'delta': cached})}\n\n"
+                yield f"event: done\ndata: {json.dumps({'response': cached, 'cached': True})}\n\n"
+                return
+            
+            context = await build_chat_context(message, evidence_manager, meeting_id=meeting_id)
+            response = ""
+            async for delta in llm_service.ask_question_stream(message, context.text):
+                response += delta
+                yield f"data: {json.dumps({'delta': delta})}\n\n"
+            cache_answer(cache_key, response)
+            yield f"event: done\ndata: {json.dumps({'response': response, 'context_usage': context.usage})}\n\n"
+        
+        return StreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no"  # Don't let proxies buffer the stream
+            }
+        )
+    
+    except Exception as e:
+        print(f"❌ Chat error: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Chat failed: {str(e)}"}
+        )
+
+
+@app.get("/chat/cache/stats")
+async def chat_cache_stats():
+    """Hit/miss counters for the transcript Q&A answer cache"""
+    return answer_cache.stats()
+
+
+@app.get("/llm/single-flight/stats")
+async def single_flight_stats():
+    """How many LLM calls were shared between identical concurrent requests"""
+    return llm_single_flight.stats()
+
+
 # ==================== Legal Document Analyzer Endpoints ====================
 
 @app.post("/analyze-legal-document")
@@ -883,7 +1250,8 @@ async def analyze_legal_document(data: dict):
         "keyPoints": [...],
         "wordHelper": [...],
         "verifiableClaims": [...],
-        "originalText": "..."
+        "originalText": "...",
+        "documentId": "ID for follow-up questions"
     }
     """
     try:
@@ -896,7 +1264,11 @@ async def analyze_legal_document(data: dict):
             )
         
         # Analyze the document
-        result = legal_document_analyzer.analyze_document(content)
+        result = await asyncio.to_thread(legal_document_analyzer.analyze_document, content)
+        
+        # Keep a chunked, embedded copy server-side so follow-up questions
+        # only need to send the document ID
+        result['documentId'] = await asyncio.to_thread(document_session_store.create, content)
         
         return JSONResponse(content=result)
         
@@ -908,6 +1280,42 @@ async def analyze_legal_document(data: dict):
         )
 
 
+@app.get("/analyze-legal-document/cache/stats")
+async def legal_analysis_cache_stats():
+    """Hit/miss counters and size of the on-disk legal analysis cache"""
+    return legal_document_analyzer.cache.stats()
+
+
+@app.get("/document-sessions/stats")
+async def document_session_stats():
+    """Number of live document Q&A sessions"""
+    return document_session_store.stats()
+
+
+async def answer_document_question(question: str, document_id: str, document_text: str):
+    """
+    Answer from the document session's most relevant passages when the ID is
+    known, otherwise from the full text the client sent. Returns None if
+    neither is usable.
+    """
+    session = document_session_store.get(document_id) if document_id else None
+    if session is None and document_text:
+        session = document_session_store.get(await asyncio.to_thread(document_session_store.create, document_text))
+    if session is None:
+        return None
+    
+    passages = await asyncio.to_thread(document_session_store.top_passages, session, question)
+    if len(passages) == len(session.chunks):
+        # Short document: send it whole
+        return await asyncio.to_thread(legal_document_analyzer.answer_question, question, session.text)
+    return await asyncio.to_thread(
+        legal_document_analyzer.answer_question,
+        question,
+        "\n\n[...]\n\n".join(passages),
+        True
+    )
+
+
 @app.post("/ask-question-legal")
 async def ask_question_legal(data: dict):
     """
@@ -916,7 +1324,8 @@ async def ask_question_legal(data: dict):
     Request body:
     {
         "question": "User's question",
-        "originalText": "Original document text"
+        "documentId": "ID returned by /analyze-legal-document",
+        "originalText": "Original document text (only needed if the ID is unknown or expired)"
     }
     
     Returns:
@@ -927,16 +1336,22 @@ async def ask_question_legal(data: dict):
     """
     try:
         question = data.get("question", "").strip()
+        document_id = (data.get("documentId") or "").strip()  # null when the client dropped its session
         original_text = data.get("originalText", "").strip()
         
-        if not question or not original_text:
+        if not question or not (document_id or original_text):
             return JSONResponse(
                 status_code=400,
-                content={"error": "Question and original text are required"}
+                content={"error": "Question and documentId or original text are required"}
             )
         
         # Get answer
-        result = legal_document_analyzer.answer_question(question, original_text)
+        result = await answer_document_question(question, document_id, original_text)
+        if result is None:
+            return JSONResponse(
+                status_code=404,
+                content={"error": "Document session expired. Please resend originalText."}
+            )
         
         return JSONResponse(content=result)
         
@@ -956,7 +1371,8 @@ async def ask_question(data: dict):
     Request body:
     {
         "question": "User's question",
-        "document_text": "Original document text"
+        "document_id": "ID returned by /analyze-legal-document",
+        "document_text": "Original document text (only needed if the ID is unknown or expired)"
     }
     
     Returns:
@@ -967,16 +1383,22 @@ async def ask_question(data: dict):
     """
     try:
         question = data.get("question", "").strip()
+        document_id = (data.get("document_id") or "").strip()
         document_text = data.get("document_text", "").strip()
         
-        if not question or not document_text:
+        if not question or not (document_id or document_text):
             return JSONResponse(
                 status_code=400,
-                content={"error": "Question and document_text are required"}
+                content={"error": "Question and document_id or document_text are required"}
             )
         
         # Get answer using the legal document analyzer
-        result = legal_document_analyzer.answer_question(question, document_text)
+        result = await answer_document_question(question, document_id, document_text)
+        if result is None:
+            return JSONResponse(
+                status_code=404,
+                content={"error": "Document session expired. Please resend document_text."}
+            )
         
         return JSONResponse(content=result)
         
@@ -2,7 +2,8 @@ import uuid
 import random
 import string
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional
+from session_summarizer import SessionSummarizer
 
 class User:
     def __init__(self, user_id: str, name: str, role: str = "Observer", meeting_id: str = None):
@@ -25,7 +26,7 @@ class User:
 
 
 class Meeting:
-    def __init__(self, meeting_id: str, host_user: User):
+    def __init__(self, meeting_id: str, host_user: User, summarize_fn: Callable[[str, int], Awaitable[str]] = None):
         self.meeting_id = meeting_id
         self.host_id = host_user.user_id
         self.host_name = host_user.name
@@ -33,6 +34,8 @@ class Meeting:
         self.transcript = []
         self.created_at = datetime.now()
         self.is_active = True
+        # Rolling summary of the transcript, built in the background as speech arrives
+        self.summarizer = SessionSummarizer(self.transcript, summarize_fn) if summarize_fn else None
         
     def add_participant(self, user: User):
         self.participants[user.user_id] = user
@@ -47,7 +50,15 @@ class Meeting:
     def add_transcript_entry(self, entry: dict):
         """Add a transcript entry to the meeting"""
         self.transcript.append(entry)
+        if self.summarizer:
+            self.summarizer.notify()
         return entry
+    
+    def get_session_summary(self) -> Optional[Dict]:
+        """Rolling summary of the session so far (None if summarization is disabled)"""
+        if not self.summarizer:
+            return None
+        return self.summarizer.summary()
         
     def get_participant_list(self):
         return [user.to_dict() for user in self.participants.values()]
@@ -65,9 +76,10 @@ class Meeting:
 
 
 class MeetingManager:
-    def __init__(self):
+    def __init__(self, summarize_fn: Callable[[str, int], Awaitable[str]] = None):
         self.meetings: Dict[str, Meeting] = {}
         self.users: Dict[str, User] = {}
+        self.summarize_fn = summarize_fn  # Enables background session summaries
         
     def generate_meeting_id(self) -> str:
         """Generate a random 6-character meeting ID"""
@@ -87,7 +99,7 @@ class MeetingManager:
     def create_meeting(self, host_user: User) -> Meeting:
         """Create a new meeting"""
         meeting_id = self.generate_meeting_id()
-        meeting = Meeting(meeting_id, host_user)
+        meeting = Meeting(meeting_id, host_user, self.summarize_fn)
         self.meetings[meeting_id] = meeting
         host_user.meeting_id = meeting_id
         print(f"🎯 Meeting created: {meeting_id} by {host_user.name}")
@@ -0,0 +1,76 @@
+"""
+Model Warm-up
+Opt-in (EVIDENCE_WARMUP=true) loading of the embedding model and text
+splitter in a background thread at startup, so the first evidence upload or
+search after a deploy does not wait for them. Importing this module loads
+nothing; GET /ready reports when warm-up is done.
+"""
+
+import os
+import time
+import threading
+from typing import Callable, Dict, List, Tuple
+
+from evidence_service import get_embeddings, get_text_splitter
+
+EVIDENCE_WARMUP = os.getenv("EVIDENCE_WARMUP", "false").lower() == "true"
+
+
+def warm_embedding_model():
+    # Load the weights and tokenizer, then run one forward pass so buffers are allocated too
+    get_embeddings().embed_query("warm-up")
+
+
+class ModelWarmup:
+    def __init__(self, steps: List[Tuple[str, Callable]], enabled: bool = EVIDENCE_WARMUP):
+        self.steps = steps
+        self.enabled = enabled
+        # pending -> loading -> ready | failed; "lazy" when warm-up is off (loaded on first use)
+        self.components: Dict[str, Dict] = {name: {"state": "pending" if enabled else "lazy"} for name, _ in steps}
+        self.seconds = None
+        self._thread = None
+
+    def start(self):
+        """Start warming up in a daemon thread (no-op when disabled or already started)"""
+        if not self.enabled or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+        self._thread.start()
+        print(f"🔥 Warming up {', '.join(name for name, _ in self.steps)} in the background")
+
+    def _run(self):
+        started = time.perf_counter()
+        for name, load in self.steps:
+            component = self.components[name]
+            component["state"] = "loading"
+            step_started = time.perf_counter()
+            try:
+                load()
+                component["state"] = "ready"
+            except Exception as e:
+                component["state"] = "failed"
+                component["error"] = str(e)
+                print(f"❌ Warm-up of {name} failed: {e}")
+            component["seconds"] = round(time.perf_counter() - step_started, 2)
+        self.seconds = round(time.perf_counter() - started, 2)
+        print(f"🔥 Warm-up finished in {self.seconds}s (" +
+              ", ".join(f"{name} {c['state']} {c['seconds']}s" for name, c in self.components.items()) + ")")
+
+    @property
+    def ready(self) -> bool:
+        return not self.enabled or all(c["state"] == "ready" for c in self.components.values())
+
+    def status(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "warmup_enabled": self.enabled,
+            "components": self.components,
+            "warmup_seconds": self.seconds
+        }
+
+
+# Global instance
+model_warmup = ModelWarmup([
+    ("embedding_model", warm_embedding_model),
+    ("text_splitter", get_text_splitter)
+])
@@ -0,0 +1,258 @@
+"""
+LLM / ASR Providers
+Chooses the chat-completions and speech-to-text backends from the environment
+
+LLM_PROVIDER=groq (default) uses the Groq SDK; LLM_BASE_URL points it at any
+Groq/OpenAI-compatible server, e.g. `fake_servers.py`. LLM_PROVIDER=fake
+answers in-process with deterministic text and no network.
+
+ASR_PROVIDER=deepgram (default) uses Deepgram; DEEPGRAM_BASE_URL points it
+at another host. ASR_PROVIDER=fake transcribes in-process.
+
+The fakes' timing is set with FAKE_LLM_LATENCY_MS (time to first token),
+FAKE_LLM_TOKENS_PER_SEC, FAKE_LLM_ANSWER_TOKENS and FAKE_ASR_LATENCY_MS.
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq").lower()
+LLM_BASE_URL = os.getenv("LLM_BASE_URL") or None
+ASR_PROVIDER = os.getenv("ASR_PROVIDER", "deepgram").lower()
+
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "300"))
+FAKE_LLM_TOKENS_PER_SEC = float(os.getenv("FAKE_LLM_TOKENS_PER_SEC", "200"))
+FAKE_LLM_ANSWER_TOKENS = int(os.getenv("FAKE_LLM_ANSWER_TOKENS", "120"))
+FAKE_ASR_LATENCY_MS = float(os.getenv("FAKE_ASR_LATENCY_MS", "200"))
+
+# 16 kHz, 16-bit mono PCM as sent by the meeting page
+PCM_BYTES_PER_SECOND = 32000
+
+_FAKE_VOCAB = [
+    "the", "court", "witness", "stated", "that", "evidence", "was", "presented",
+    "under", "section", "accused", "counsel", "argued", "hearing", "record",
+    "bail", "defence", "prosecution", "alibi", "document", "exhibit", "notice",
+    "agreement", "clause", "payment", "date", "judge", "observed", "complaint",
+    "police", "statement", "filed", "matter", "adjourned", "relief", "order",
+]
+
+
+# ==================== Deterministic fake output ====================
+
+def _rng_for(*parts) -> random.Random:
+    seed = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).digest()
+    return random.Random(seed)
+
+
+def fake_words(rng: random.Random, count: int) -> List[str]:
+    return [rng.choice(_FAKE_VOCAB) for _ in range(count)]
+
+
+def fake_completion_text(messages: List[Dict], max_tokens: int = 500, json_mode: bool = False) -> str:
+    """Deterministic answer for a chat request: same messages in, same text out"""
+    rng = _rng_for(messages)
+    words = fake_words(rng, min(max_tokens, FAKE_LLM_ANSWER_TOKENS))
+    sentence = " ".join(words).capitalize() + "."
+    if not json_mode:
+        return sentence
+
+    system_prompt = messages[0]["content"] if messages else ""
+    if "keyPoints" in system_prompt:
+        # Legal document analysis schema
+        terms = sorted(set(fake_words(rng, 3)))
+        return json.dumps({
+            "summary": f"[CRITICAL:{' '.join(words[:4])}] {sentence}",
+            "colorCodedOriginalText": sentence,
+            "keyPoints": [" ".join(words[i:i + 8]) for i in range(0, min(len(words), 24), 8)],
+            "extraInfo": [" ".join(words[-8:])],
+            "wordHelper": [
+                {"term": term, "simpleDefinition": f"Simple meaning of {term}", "detailedDefinition": f"Detailed meaning of {term}"}
+                for term in terms
+            ],
+            "verifiableClaims": [
+                {"claim": " ".join(words[:6]), "link": "https://google.com/search?q=" + "+".join(words[:6])}
+            ]
+        })
+    return json.dumps({
+        "answer": sentence,
+        "suggestions": [" ".join(fake_words(rng, 5)).capitalize() + "?" for _ in range(2)]
+    })
+
+
+def fake_transcript_text(seed: str, seconds: float) -> str:
+    """Roughly 2.5 words per second of audio"""
+    rng = _rng_for(seed)
+    return " ".join(fake_words(rng, max(1, int(seconds * 2.5)))).capitalize() + "."
+
+
+def fake_prerecorded_response(audio_data: bytes, filename: str) -> Dict:
+    """Deepgram /v1/listen prerecorded response shape"""
+    seconds = max(1.0, len(audio_data) / PCM_BYTES_PER_SECOND)
+    text = fake_transcript_text(hashlib.sha256(audio_data).hexdigest(), min(seconds, 600))
+    return {
+        "metadata": {"request_id": "fake", "duration": seconds, "channels": 1},
+        "results": {
+            "channels": [{"alternatives": [{"transcript": text, "confidence": 0.99}]}]
+        }
+    }
+
+
+def fake_live_message(text: str, is_final: bool, start: float, duration: float) -> Dict:
+    """Deepgram live 'Results' message shape"""
+    return {
+        "type": "Results",
+        "start": start,
+        "duration": duration,
+        "is_final": is_final,
+        "channel": {"alternatives": [{"transcript": text, "confidence": 0.99}]}
+    }
+
+
+# ==================== In-process fake LLM client ====================
+
+def _completion(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason="stop")])
+
+
+def _chunk(content: Optional[str]):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content), finish_reason=None)])
+
+
+def token_pieces(text: str) -> List[str]:
+    words = text.split(" ")
+    return [word + (" " if i < len(words) - 1 else "") for i, word in enumerate(words)]
+
+
+class _FakeCompletions:
+    def __init__(self, is_async: bool):
+        self.is_async = is_async
+
+    def _text(self, messages, max_tokens=500, response_format=None, **kwargs):
+        json_mode = bool(response_format and response_format.get("type") == "json_object")
+        return fake_completion_text(messages, max_tokens or 500, json_mode)
+
+    def create(self, messages, stream: bool = False, **kwargs):
+        text = self._text(messages, **kwargs)
+        pieces = token_pieces(text)
+        generation_seconds = len(pieces) / FAKE_LLM_TOKENS_PER_SEC
+        if not self.is_async:
+            time.sleep(FAKE_LLM_LATENCY_MS / 1000 + generation_seconds)
+            return _completion(text)
+        if stream:
+            return self._astream(pieces)
+        return self._acreate(text, generation_seconds)
+
+    async def _acreate(self, text, generation_seconds):
+        await asyncio.sleep(FAKE_LLM_LATENCY_MS / 1000 + generation_seconds)
+        return _completion(text)
+
+    async def _astream(self, pieces):
+        await asyncio.sleep(FAKE_LLM_LATENCY_MS / 1000)
+
+        async def chunks():
+            for piece in pieces:
+                await asyncio.sleep(1 / FAKE_LLM_TOKENS_PER_SEC)
+                yield _chunk(piece)
+
+        return chunks()
+
+
+class FakeChatClient:
+    """Mimics the parts of Groq / AsyncGroq the services use: client.chat.completions.create"""
+    def __init__(self, is_async: bool = False):
+        self.chat = SimpleNamespace(completions=_FakeCompletions(is_async))
+
+
+def create_chat_clients() -> Tuple[object, object]:
+    """(sync client, async client) for the configured LLM provider"""
+    if LLM_PROVIDER == "fake":
+        return FakeChatClient(is_async=False), FakeChatClient(is_async=True)
+
+    from groq import Groq, AsyncGroq
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        raise ValueError("GROQ_API_KEY not found in environment (or set LLM_PROVIDER=fake)")
+    return Groq(api_key=api_key, base_url=LLM_BASE_URL), AsyncGroq(api_key=api_key, base_url=LLM_BASE_URL)
+
+
+# ==================== In-process fake ASR ====================
+
+class FakeLiveConnection:
+    """
+    Stands in for the Deepgram live websocket: accepts PCM chunks through
+    `send` and yields interim/final result messages as enough audio arrives.
+    """
+    def __init__(self, utterance_seconds: float = 3.0):
+        self.utterance_seconds = utterance_seconds
+        self._messages: asyncio.Queue = asyncio.Queue()
+        self._buffered = 0
+        self._elapsed = 0.0
+        self._utterance = 0
+
+    async def send(self, data: bytes):
+        previous = self._buffered
+        self._buffered += len(data)
+        utterance_bytes = self.utterance_seconds * PCM_BYTES_PER_SECOND
+        seconds = self._buffered / PCM_BYTES_PER_SECOND
+
+        if self._buffered >= utterance_bytes:
+            # Enough audio for a finalized utterance
+            self._buffered = 0
+            self._utterance += 1
+            text = fake_transcript_text(f"utterance-{self._utterance}", seconds)
+            await asyncio.sleep(FAKE_ASR_LATENCY_MS / 1000)
+            await self._messages.put(json.dumps(fake_live_message(text, True, self._elapsed, seconds)))
+            self._elapsed += seconds
+        elif previous < utterance_bytes / 2 <= self._buffered:
+            # One interim result half way through
+            text = fake_transcript_text(f"utterance-{self._utterance + 1}", seconds)
+            await self._messages.put(json.dumps(fake_live_message(text, False, self._elapsed, seconds)))
+
+    async def close(self):
+        await self._messages.put(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self._messages.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+class FakeTranscriber:
+    """Same interface as DeepgramTranscriber, answering in-process"""
+    def __init__(self):
+        self.connection = None
+
+    async def connect(self):
+        self.connection = FakeLiveConnection()
+        return self.connection
+
+    async def close(self):
+        if self.connection:
+            await self.connection.close()
+
+    def transcribe_file(self, audio_data, filename="audio"):
+        if hasattr(audio_data, "read"):
+            audio_data = audio_data.read()
+        time.sleep(FAKE_ASR_LATENCY_MS / 1000)
+        return fake_prerecorded_response(audio_data, filename)
+
+
+def create_transcriber():
+    """Speech-to-text client for the configured ASR provider"""
+    if ASR_PROVIDER == "fake":
+        return FakeTranscriber()
+    from deepgram_service import DeepgramTranscriber
+    return DeepgramTranscriber()
@@ -1,14 +1,14 @@
 from datetime import datetime
 from typing import Dict, List
-import os
-from groq import Groq
 from dotenv import load_dotenv
+from providers import create_chat_clients
+from single_flight import llm_single_flight, fingerprint
 
 load_dotenv()
 
 class ReportGenerator:
     def __init__(self):
-        self.client = Groq(api_key=os.getenv('GROQ_API_KEY'))
+        self.client, _ = create_chat_clients()
         
     def generate_report_content(self, meeting_data: Dict) -> Dict:
         """Generate comprehensive court report from meeting data"""
@@ -23,9 +23,10 @@ class ReportGenerator:
             participants = meeting_data.get('participants', [])
             start_time = meeting_data.get('start_time', datetime.now().isoformat())
             duration = meeting_data.get('duration', 'N/A')
+            session_summary = meeting_data.get('session_summary')
             
             # Generate AI summary
-            summary = self._generate_ai_summary(transcript, evidence, criminal_records, chat_history)
+            summary = self._generate_ai_summary(transcript, evidence, criminal_records, chat_history, session_summary)
             
             # Format report
             report = {
@@ -45,12 +46,21 @@ class ReportGenerator:
             print(f"Error generating report: {e}")
             return None
     
-    def _generate_ai_summary(self, transcript, evidence, criminal_records, chat_history):
+    def _generate_ai_summary(self, transcript, evidence, criminal_records, chat_history, session_summary=None):
         """Use dedicated AI agent to generate comprehensive court report summary"""
         try:
-            # Prepare context
+            # Prepare context. With a rolling session summary only the statements
+            # it doesn't cover yet are sent verbatim, so nothing is dropped.
+            covered = session_summary.get('entries_covered', 0) if session_summary else 0
             transcript_text = "\n".join([f"[{entry.get('timestamp', 'N/A')}] {entry.get('speaker', 'Unknown')} ({entry.get('role', 'Unknown')}): {entry.get('text', '')}" 
-                                        for entry in transcript])
+                                        for entry in transcript[covered:]])
+            if covered:
+                transcript_text = (
+                    f"SUMMARY OF STATEMENTS 1-{covered}:\n{session_summary['text']}\n\n"
+                    f"LATEST STATEMENTS (VERBATIM):\n{transcript_text[-4000:] if transcript_text else 'None.'}"
+                )
+            else:
+                transcript_text = transcript_text[:4000]
             
             evidence_text = "\n".join([f"• Document: {ev.get('name', 'Unknown')}\n  Type: {ev.get('type', 'Unknown')}\n  Analysis: {ev.get('analysis', 'No analysis available')}" 
                                        for ev in evidence])
@@ -85,7 +95,7 @@ Guidelines:
 ═══════════════════════════════════════════════════════════════
 SESSION TRANSCRIPT:
 ═══════════════════════════════════════════════════════════════
-{transcript_text[:4000] if transcript_text else "No transcript recorded."}
+{transcript_text if transcript_text else "No transcript recorded."}
 
 ═══════════════════════════════════════════════════════════════
 EVIDENCE DOCUMENTS PRESENTED:
@@ -112,7 +122,7 @@ Based on the above information, generate a professional EXECUTIVE SUMMARY that i
 
 Keep the summary factual, objective, and professionally formatted. Use clear section headers. Maximum 800 words."""
 
-            response = self.client.chat.completions.create(
+            request = dict(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
@@ -122,7 +132,11 @@ Keep the summary factual, objective, and professionally formatted. Use clear sec
                 max_tokens=2000
             )
             
-            return response.choices[0].message.content
+            # Participants generating the same report at once share one Groq call
+            return llm_single_flight.do(
+                fingerprint(**request),
+                lambda: self.client.chat.completions.create(**request).choices[0].message.content
+            )
             
         except Exception as e:
             print(f"Error generating AI summary: {e}")
@@ -249,6 +263,10 @@ Report Generated:      {datetime.now().strftime("%B %d, %Y at %I:%M %p")}
             section += f"EXHIBIT {i}:\n"
             section += f"  Document Name: {name}\n"
             section += f"  File Type: {file_type}\n"
+            if ev.get('pages'):
+                section += f"  Pages: {ev['pages']}\n"
+            if ev.get('aliases'):
+                section += f"  Also Submitted As: {', '.join(ev['aliases'])}\n"
             section += f"  AI Analysis Summary:\n"
             section += f"  {analysis}\n\n"
             section += "  " + "─" * 60 + "\n\n"
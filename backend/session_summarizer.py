@@ -0,0 +1,92 @@
+"""
+Session Summarizer
+Folds a live meeting transcript into a rolling summary tree in the background
+"""
+
+import os
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from context_builder import compact_time
+
+# Final transcript entries per leaf summary, and summaries per parent
+SUMMARY_BLOCK_SIZE = int(os.getenv("SUMMARY_BLOCK_SIZE", "20"))
+SUMMARY_FANOUT = int(os.getenv("SUMMARY_FANOUT", "4"))
+
+
+class SessionSummarizer:
+    """
+    Each block of `block_size` final entries becomes a level-0 summary. When
+    `fanout` summaries pile up on a level they are merged into one summary on
+    the level above, like carrying in a binary counter. At any time the
+    whole session is covered by at most `fanout - 1` nodes per level, so a
+    summary of everything said so far is always ready without touching the
+    raw transcript.
+    """
+    def __init__(self, transcript: List[Dict], summarize_fn: Callable[[str, int], Awaitable[str]],
+                 block_size: int = SUMMARY_BLOCK_SIZE, fanout: int = SUMMARY_FANOUT):
+        self.transcript = transcript
+        self.summarize_fn = summarize_fn
+        self.block_size = block_size
+        self.fanout = fanout
+        self.levels: List[List[str]] = []  # levels[0] holds the newest, finest summaries
+        self.entries_covered = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self):
+        """Called after each new transcript entry; schedules folding when a block is complete"""
+        if len(self.transcript) - self.entries_covered < self.block_size:
+            return
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No event loop (e.g. scripts); fold on the next notify from async code
+        self._task = loop.create_task(self._drain())
+
+    async def _drain(self):
+        """Fold every complete block that has arrived, including ones that land meanwhile"""
+        while len(self.transcript) - self.entries_covered >= self.block_size:
+            block = self.transcript[self.entries_covered:self.entries_covered + self.block_size]
+            text = "\n".join(
+                f"{compact_time(entry.get('timestamp', ''))} {entry.get('speaker', 'Speaker')}: {entry.get('text', '')}"
+                for entry in block
+            )
+            try:
+                summary = await self.summarize_fn(text, 0)
+            except Exception as e:
+                print(f"⚠️ Block summary failed, will retry on next speech: {e}")
+                return
+            self._add_node(0, summary)
+            self.entries_covered += len(block)
+            await self._carry()
+
+    def _add_node(self, level: int, summary: str):
+        while len(self.levels) <= level:
+            self.levels.append([])
+        self.levels[level].append(summary)
+
+    async def _carry(self):
+        """Merge any full level into a single node one level up"""
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) >= self.fanout:
+                children = self.levels[level][:self.fanout]
+                try:
+                    merged = await self.summarize_fn("\n\n".join(children), level + 1)
+                except Exception as e:
+                    print(f"⚠️ Summary merge failed, keeping level {level} unmerged: {e}")
+                    return
+                del self.levels[level][:self.fanout]
+                self._add_node(level + 1, merged)
+            level += 1
+
+    def summary(self) -> Dict:
+        """Current summary of the covered part of the session, oldest material first"""
+        nodes = [node for level in reversed(self.levels) for node in level]
+        return {
+            "text": "\n\n".join(nodes),
+            "entries_covered": self.entries_covered,
+            "entries_pending": len(self.transcript) - self.entries_covered
+        }
@@ -0,0 +1,115 @@
+"""
+Single-Flight LLM Calls
+Concurrent identical LLM requests share one upstream call and its result
+"""
+
+import json
+import asyncio
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+
+def fingerprint(**request) -> str:
+    """Stable hash of a completion request (model, messages, sampling params...)"""
+    payload = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    The first caller for a fingerprint makes the upstream call; anyone who
+    asks for the same fingerprint while it is in flight waits for and shares
+    that result (or exception). Nothing is cached once the call completes.
+    `do` serves threads (sync Groq clients run via asyncio.to_thread), and
+    `do_async` serves coroutines on the event loop.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+        self.upstream_calls = 0
+        self.coalesced_calls = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn() once per key across threads, fanning its result out to every concurrent caller"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.upstream_calls += 1
+            else:
+                self.coalesced_calls += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: str, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await coro_fn() once per key on the event loop. Cancelling one waiter
+        leaves the shared call running for the others; it is only cancelled
+        when every waiter has gone away.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_fn())
+            self._tasks[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda _: self._forget(key, task))
+            self.upstream_calls += 1
+        else:
+            self.coalesced_calls += 1
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._tasks.get(key) is task and self._waiters[key] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            if self._tasks.get(key) is task:
+                self._waiters[key] -= 1
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+            del self._waiters[key]
+
+    def stats(self) -> Dict:
+        """Upstream calls made vs. calls saved by sharing"""
+        requests = self.upstream_calls + self.coalesced_calls
+        return {
+            "upstream_calls": self.upstream_calls,
+            "coalesced_calls": self.coalesced_calls,
+            "in_flight": len(self._calls) + len(self._tasks),
+            "saved_ratio": round(self.coalesced_calls / requests, 4) if requests else 0.0
+        }
+
+
+# Global instance shared by every LLM-backed service
+llm_single_flight = SingleFlight()
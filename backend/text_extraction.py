@@ -0,0 +1,189 @@
+"""
+Text Extraction
+PDF text extraction and page-level OCR, run in a pool of worker processes so
+a scanned exhibit never blocks the event loop (or live transcription)
+
+PDF pages that have a text layer are read directly. Pages without one, and
+every frame of an image (multi-page TIFFs included), are rasterized and OCRed
+as separate pool tasks, so a scanned bundle takes roughly
+pages / EXTRACTION_WORKERS x the time of one page. Results always come back
+in page order, one entry per page.
+"""
+
+import os
+import time
+import asyncio
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from PyPDF2 import PdfReader
+from PIL import Image
+import pytesseract
+
+# Leave one core for the event loop by default
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "0")) or max(1, (os.cpu_count() or 2) - 1)
+OCR_DPI = int(os.getenv("OCR_DPI", "300"))
+# PDF pages whose text layer has fewer characters than this are treated as scanned
+OCR_MIN_TEXT_CHARS = int(os.getenv("OCR_MIN_TEXT_CHARS", "20"))
+
+IMAGE_EXTENSIONS = ['jpg', 'jpeg', 'png', 'bmp', 'tiff']
+DOCUMENT_EXTENSIONS = ['pdf'] + IMAGE_EXTENSIONS
+
+
+# ==================== Per-page tasks (run in worker processes) ====================
+
+def pdf_text_layer(path: str) -> List[str]:
+    """Embedded text of every PDF page ('' for pages without a text layer)"""
+    try:
+        with open(path, "rb") as f:
+            pdf = PdfReader(f)
+            return [page.extract_text() or "" for page in pdf.pages]
+    except Exception as e:
+        raise Exception(f"Error extracting PDF text: {e}")
+
+
+def ocr_pdf_page(path: str, page_index: int) -> str:
+    """Rasterize one PDF page and OCR it"""
+    import pypdfium2 as pdfium
+    try:
+        pdf = pdfium.PdfDocument(path)
+        try:
+            page = pdf[page_index]
+            image = page.render(scale=OCR_DPI / 72).to_pil()
+            page.close()
+        finally:
+            pdf.close()
+        return pytesseract.image_to_string(image)
+    except Exception as e:
+        raise Exception(f"Error running OCR on PDF page {page_index + 1}: {e}")
+
+
+def image_frame_count(path: str) -> int:
+    with Image.open(path) as image:
+        return getattr(image, "n_frames", 1)
+
+
+def ocr_image_frame(path: str, frame_index: int) -> str:
+    """OCR one frame of an image (TIFFs can hold many pages)"""
+    try:
+        with Image.open(path) as image:
+            image.seek(frame_index)
+            return pytesseract.image_to_string(image.copy())
+    except Exception as e:
+        raise Exception(f"Error extracting image text: {e}")
+
+
+# ==================== Whole-document helpers ====================
+
+def _page_entries(texts: List[str], ocr_pages: List[int]) -> List[Dict]:
+    ocr = set(ocr_pages)
+    return [{"page": i + 1, "text": text, "ocr": i in ocr} for i, text in enumerate(texts)]
+
+
+def _scanned_pages(texts: List[str]) -> List[int]:
+    return [i for i, text in enumerate(texts) if len(text.strip()) < OCR_MIN_TEXT_CHARS]
+
+
+def _write_temp(file_bytes: bytes, file_ext: str) -> str:
+    with tempfile.NamedTemporaryFile(suffix=f".{file_ext}", delete=False) as f:
+        f.write(file_bytes)
+        return f.name
+
+
+def extract_pdf_text(file_bytes: bytes) -> str:
+    """Extract text from PDF file"""
+    return "\n".join(page["text"] for page in extract_pages(file_bytes, "pdf"))
+
+
+def extract_image_text(file_bytes: bytes) -> str:
+    """Extract text from image using OCR"""
+    return "\n".join(page["text"] for page in extract_pages(file_bytes, "png"))
+
+
+def extract_pages(file_bytes: bytes, file_ext: str) -> List[Dict]:
+    """Page-by-page text of a PDF or image in this process, OCRing where needed"""
+    if file_ext not in DOCUMENT_EXTENSIONS:
+        raise ValueError(f"Unsupported file type: {file_ext}")
+    path = _write_temp(file_bytes, file_ext)
+    try:
+        if file_ext == 'pdf':
+            texts = pdf_text_layer(path)
+            scanned = _scanned_pages(texts)
+            for i in scanned:
+                texts[i] = ocr_pdf_page(path, i)
+        else:
+            scanned = list(range(image_frame_count(path)))
+            texts = [ocr_image_frame(path, i) for i in scanned]
+        return _page_entries(texts, scanned)
+    finally:
+        os.remove(path)
+
+
+def _init_worker():
+    # One OCR thread per worker, so workers x threads never exceeds the cap
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """Shared worker pool, started on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: workers must not inherit the server's threads and sockets
+            _pool = ProcessPoolExecutor(
+                max_workers=EXTRACTION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+            print(f"⚙️ Text extraction pool started ({EXTRACTION_WORKERS} workers)")
+    return _pool
+
+
+async def extract_pages_async(file_bytes: bytes, file_ext: str, path: str = None) -> Dict:
+    """
+    extract_pages spread over the worker pool, one task per page to OCR.
+    Returns the pages plus how many needed OCR and the wall-clock seconds.
+    """
+    if file_ext not in DOCUMENT_EXTENSIONS:
+        raise ValueError(f"Unsupported file type: {file_ext}")
+    loop = asyncio.get_running_loop()
+    pool = get_extraction_pool()
+    started = time.perf_counter()
+    # Workers read the file from disk rather than receiving a copy of it per page
+    temp_path = None
+    if path is None:
+        temp_path = path = await asyncio.to_thread(_write_temp, file_bytes, file_ext)
+    try:
+        if file_ext == 'pdf':
+            texts = await loop.run_in_executor(pool, pdf_text_layer, path)
+            scanned = _scanned_pages(texts)
+            ocr_texts = await asyncio.gather(*[loop.run_in_executor(pool, ocr_pdf_page, path, i) for i in scanned])
+            for i, text in zip(scanned, ocr_texts):
+                texts[i] = text
+        else:
+            frames = await loop.run_in_executor(pool, image_frame_count, path)
+            scanned = list(range(frames))
+            texts = list(await asyncio.gather(*[loop.run_in_executor(pool, ocr_image_frame, path, i) for i in scanned]))
+    finally:
+        if temp_path:
+            os.remove(temp_path)
+    return {
+        "pages": _page_entries(texts, scanned),
+        "ocr_pages": len(scanned),
+        "seconds": time.perf_counter() - started
+    }
+
+
+def shutdown_extraction_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
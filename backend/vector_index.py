@@ -0,0 +1,251 @@
+"""
+Vector Index
+FAISS index over evidence chunk embeddings, addressed by stable int64 chunk IDs
+so vectors can be added incrementally instead of rebuilding from scratch
+
+Index types (EVIDENCE_INDEX_TYPE):
+
+    flat    exact search over float32 vectors (d x 4 bytes each)
+    hnsw    graph search, faster than flat on large sets; vectors stay float32
+    ivfpq   inverted lists of product-quantized codes (PQ_M bytes each);
+            trained on the vectors present once there are enough of them.
+            The best k x IVF_REFINE candidates are re-ranked with their exact
+            vectors when the owner can look them up (e.g. memory-mapped from disk)
+    auto    flat, converted to ivfpq once EVIDENCE_ANN_THRESHOLD vectors are indexed
+"""
+
+import os
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+EVIDENCE_INDEX_TYPE = os.getenv("EVIDENCE_INDEX_TYPE", "auto")
+EVIDENCE_ANN_THRESHOLD = int(os.getenv("EVIDENCE_ANN_THRESHOLD", "50000"))
+HNSW_M = int(os.getenv("HNSW_M", "32"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "80"))
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "64"))
+IVF_NLIST = int(os.getenv("IVF_NLIST", "0"))  # 0 = 4 x sqrt(vectors at training time)
+IVF_NPROBE = int(os.getenv("IVF_NPROBE", "16"))
+PQ_M = int(os.getenv("PQ_M", "0"))  # Sub-quantizers = bytes per code; 0 = dimension / 8
+IVF_REFINE = int(os.getenv("IVF_REFINE", "8"))  # 0 = return PQ distances as they are
+
+# PQ codebooks (256 centroids per sub-quantizer) need ~39 points per centroid
+IVFPQ_MIN_TRAIN = 256 * 39
+IVFPQ_MAX_TRAIN = 100_000
+# Flat and HNSW removals are tombstones filtered out at search time (HNSW
+# cannot delete nodes; a flat remove_ids compacts the whole index), so removing
+# a file costs its own chunks. Once they make up this share of the index it is
+# compacted in one pass (flat) or rebuilt without them (HNSW)
+MAX_DELETED_RATIO = 0.2
+
+
+class VectorIndex:
+    """
+    L2 search (squared distance, lower is closer; approximate for hnsw and
+    ivfpq) with results returned as (chunk_id, score). The dimension is
+    taken from the first batch of vectors added. Safe to use from several
+    threads: each call holds the index for its duration.
+    """
+    def __init__(self, index_type: str = EVIDENCE_INDEX_TYPE, ann_threshold: int = EVIDENCE_ANN_THRESHOLD,
+                 vector_lookup: Optional[Callable[[List[int]], Optional[np.ndarray]]] = None):
+        if index_type not in ("auto", "flat", "hnsw", "ivfpq"):
+            raise ValueError(f"Unknown index type: {index_type}")
+        self.index_type = index_type
+        self.ann_threshold = ann_threshold
+        self.index = None
+        self.kind = None  # Structure in use: flat, hnsw or ivfpq
+        self.dimension = None
+        self.deleted = set()  # Flat and HNSW tombstones
+        self._deleted_selector = None
+        self.trained_at = None  # Vectors used to train the IVF-PQ index
+        self.vector_lookup = vector_lookup  # Chunk IDs -> exact vectors (or None), for re-ranking
+        # FAISS indexes are not safe to search while another thread adds, removes or swaps them
+        # (stats() reads without it, so status endpoints never wait on a conversion)
+        self._lock = threading.RLock()
+
+    def _ensure_index(self, dimension: int):
+        if self.index is None:
+            import faiss
+            self.dimension = dimension
+            if self.index_type == "hnsw":
+                graph = faiss.IndexHNSWFlat(dimension, HNSW_M)
+                graph.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+                self.index, self.kind = faiss.IndexIDMap2(graph), "hnsw"
+            else:
+                self.index, self.kind = faiss.IndexIDMap2(faiss.IndexFlatL2(dimension)), "flat"
+
+    def add(self, ids: List[int], vectors: np.ndarray):
+        """Add one vector per chunk ID"""
+        with self._lock:
+            if not len(ids):
+                return
+            vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            self._ensure_index(vectors.shape[1])
+            self.index.add_with_ids(vectors, np.asarray(ids, dtype=np.int64))
+            if self.kind == "flat" and self.index_type in ("auto", "ivfpq"):
+                threshold = IVFPQ_MIN_TRAIN if self.index_type == "ivfpq" else max(self.ann_threshold, IVFPQ_MIN_TRAIN)
+                if self.index.ntotal >= threshold:
+                    self._convert_to_ivfpq()
+
+    def _stored_vectors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids, vectors) held by a flat or HNSW index, tombstones excluded"""
+        import faiss
+        ids = faiss.vector_to_array(self.index.id_map).astype(np.int64)
+        vectors = self.index.index.reconstruct_n(0, self.index.ntotal)
+        if self.deleted:
+            keep = ~np.isin(ids, np.fromiter(self.deleted, dtype=np.int64))
+            ids, vectors = ids[keep], vectors[keep]
+        return ids, vectors
+
+    def _convert_to_ivfpq(self):
+        """Train an IVF-PQ index on the vectors indexed so far and move them into it"""
+        import faiss
+        started = time.perf_counter()
+        ids, vectors = self._stored_vectors()
+        nlist = IVF_NLIST or int(4 * np.sqrt(len(ids)))
+        nlist = max(16, min(nlist, len(ids) // 39))
+        m = PQ_M or max(1, self.dimension // 8)
+        while self.dimension % m:
+            m -= 1  # Sub-quantizers must divide the dimension
+        index = faiss.IndexIVFPQ(faiss.IndexFlatL2(self.dimension), self.dimension, nlist, m, 8)
+        sample = vectors
+        if len(vectors) > IVFPQ_MAX_TRAIN:
+            sample = vectors[np.random.default_rng(0).choice(len(vectors), IVFPQ_MAX_TRAIN, replace=False)]
+        index.train(np.ascontiguousarray(sample))
+        index.nprobe = IVF_NPROBE
+        index.add_with_ids(np.ascontiguousarray(vectors), ids)
+        self.index, self.kind = index, "ivfpq"
+        self.deleted, self._deleted_selector = set(), None
+        self.trained_at = len(ids)
+        print(f"🧭 Evidence index switched to IVF-PQ (nlist={nlist}, m={m}) for {len(ids)} vectors "
+              f"in {time.perf_counter() - started:.1f}s")
+
+    def trained_state(self) -> Optional[bytes]:
+        """Serialized empty IVF-PQ index (coarse centroids and PQ codebooks), if one has been trained"""
+        with self._lock:
+            if self.kind != "ivfpq":
+                return None
+            import faiss
+            empty = faiss.clone_index(self.index)
+            empty.reset()
+            return faiss.serialize_index(empty).tobytes()
+
+    def load_trained(self, data: bytes):
+        """Start from a previously trained IVF-PQ index instead of a flat one, so it is not retrained"""
+        with self._lock:
+            import faiss
+            index = faiss.deserialize_index(np.frombuffer(data, dtype=np.uint8))
+            index.nprobe = IVF_NPROBE
+            self.reset()
+            self.index, self.kind, self.dimension = index, "ivfpq", index.d
+
+    def remove(self, ids: List[int]) -> int:
+        """
+        Remove the vectors stored under these chunk IDs; returns how many were
+        removed. IVF-PQ removes them at once, scanning its inverted lists.
+        """
+        with self._lock:
+            if self.index is None or not len(ids):
+                return 0
+            if self.kind == "ivfpq":
+                return self.index.remove_ids(np.asarray(ids, dtype=np.int64))
+            new = {chunk_id for chunk_id in map(int, ids) if chunk_id not in self.deleted and self._is_stored(chunk_id)}
+            self.deleted |= new
+            self._deleted_selector = None
+            if len(self.deleted) > MAX_DELETED_RATIO * self.index.ntotal:
+                self._compact()
+            return len(new)
+
+    def _is_stored(self, chunk_id: int) -> bool:
+        try:
+            self.index.reconstruct(chunk_id)  # Looked up in the ID map's reverse index
+            return True
+        except RuntimeError:
+            return False
+
+    def _compact(self):
+        """Drop tombstoned vectors for good"""
+        if self.kind == "hnsw":
+            self._rebuild_hnsw()
+            return
+        self.index.remove_ids(np.fromiter(self.deleted, dtype=np.int64))
+        self.deleted, self._deleted_selector = set(), None
+
+    def _rebuild_hnsw(self):
+        ids, vectors = self._stored_vectors()
+        self.index, self.deleted, self._deleted_selector = None, set(), None
+        self._ensure_index(vectors.shape[1])
+        if len(ids):
+            self.index.add_with_ids(np.ascontiguousarray(vectors), ids)
+
+    def _search_params(self):
+        import faiss
+        if self.kind == "ivfpq":
+            return None
+        if self.deleted and self._deleted_selector is None:
+            batch = faiss.IDSelectorBatch(np.fromiter(self.deleted, dtype=np.int64))
+            self._deleted_selector = (batch, faiss.IDSelectorNot(batch))  # Keep both alive
+        selector = self._deleted_selector[1] if self.deleted else None
+        if self.kind == "hnsw":
+            return faiss.SearchParametersHNSW(efSearch=HNSW_EF_SEARCH, sel=selector)
+        return faiss.SearchParameters(sel=selector) if selector is not None else None
+
+    def search(self, vector, k: int) -> List[Tuple[int, float]]:
+        """The k nearest chunk IDs with their distances"""
+        with self._lock:
+            if not len(self):
+                return []
+            query = np.ascontiguousarray(np.asarray(vector, dtype=np.float32).reshape(1, -1))
+            refine = self.kind == "ivfpq" and self.vector_lookup is not None and IVF_REFINE > 0
+            fetch = min(k * IVF_REFINE if refine else k, len(self))
+            distances, ids = self.index.search(query, fetch, params=self._search_params())
+            results = [(int(chunk_id), float(distance)) for chunk_id, distance in zip(ids[0], distances[0]) if chunk_id != -1]
+            if refine and results:
+                exact = self.vector_lookup([chunk_id for chunk_id, _ in results])
+                if exact is not None:
+                    distances = ((np.asarray(exact, dtype=np.float32) - query) ** 2).sum(axis=1)
+                    results = [(results[i][0], float(distances[i])) for i in np.argsort(distances)]
+            return results[:k]
+
+    def reset(self):
+        with self._lock:
+            self.index = None
+            self.kind = None
+            self.dimension = None
+            self.deleted = set()
+            self._deleted_selector = None
+            self.trained_at = None
+
+    def bytes_per_vector(self) -> float:
+        """Approximate index memory per stored vector, including IDs and graph links"""
+        if not self.dimension:
+            return 0.0
+        if self.kind == "ivfpq":
+            fixed = (self.index.nlist + 256) * self.dimension * 4  # Coarse centroids and PQ codebooks
+            return self.index.code_size + 8 + fixed / max(1, self.index.ntotal)
+        links = 2 * HNSW_M * 4 if self.kind == "hnsw" else 0
+        return self.dimension * 4 + 8 + links
+
+    def stats(self) -> Dict:
+        stats = {
+            "configured_type": self.index_type,
+            "type": self.kind,
+            "vectors": len(self),
+            "dimension": self.dimension,
+            "bytes_per_vector": round(self.bytes_per_vector(), 1),
+            "memory_mb": round(self.bytes_per_vector() * len(self) / (1024 * 1024), 2)
+        }
+        if self.kind in ("flat", "hnsw"):
+            stats["deleted"] = len(self.deleted)
+        if self.kind == "hnsw":
+            stats.update(m=HNSW_M, ef_search=HNSW_EF_SEARCH)
+        elif self.kind == "ivfpq":
+            stats.update(nlist=self.index.nlist, nprobe=self.index.nprobe, code_bytes=self.index.code_size)
+        elif self.index_type == "auto":
+            stats["switches_at"] = max(self.ann_threshold, IVFPQ_MIN_TRAIN)
+        return stats
+
+    def __len__(self):
+        return self.index.ntotal - len(self.deleted) if self.index is not None else 0